@@ -1,10 +1,11 @@
 from flask import Flask
 from flask_cors import CORS
-from flask_migrate import Migrate
 from dotenv import load_dotenv
 import os
 import sys
 import logging
+import orjson
+from sqlalchemy import event
 
 # Add the project root directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -17,6 +18,40 @@ logger = logging.getLogger(__name__)
 from .database import db
 from .api.unity_routes import unity_api
 
+def orjson_serializer(obj):
+    """Serialize JSON/JSONB column values with orjson; non-string keys are stringified like json.dumps."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+def log_lazy_loads(session):
+    """
+    Log each ORM lazy load on the session as a possible N+1 query.
+
+    Built on SQLAlchemy's do_orm_execute event, so it only logs: requests
+    behave exactly as without it. Meant for development.
+    """
+    lazy_load_logger = logging.getLogger("spyengine.lazy_loads")
+
+    @event.listens_for(session, "do_orm_execute")
+    def _log_lazy_load(orm_execute_state):
+        if orm_execute_state.lazy_loaded_from is not None:
+            lazy_load_logger.warning(
+                "Lazy load of %s (possible N+1 query)",
+                orm_execute_state.loader_strategy_path[-1]
+            )
+
+def running_flask_cli():
+    """
+    Whether this process is the `flask` command line tool.
+
+    Covers both the `flask` entry point script and `python -m flask`, whose
+    argv[0] is the path to flask/__main__.py.
+    """
+    script = os.path.abspath(sys.argv[0]) if sys.argv and sys.argv[0] else ""
+    name = os.path.basename(script)
+    if name in ("flask", "flask.exe", "flask-script.py"):
+        return True
+    return name == "__main__.py" and os.path.basename(os.path.dirname(script)) == "flask"
+
 def create_app():
     # Load environment variables
     load_dotenv()
@@ -28,11 +63,23 @@ def create_app():
     app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
         "pool_recycle": 300,
         "pool_pre_ping": True,
+        # Node branch_metadata and other JSONB payloads are encoded/decoded with orjson
+        "json_serializer": orjson_serializer,
+        "json_deserializer": orjson.loads,
     }
     
-    # Initialize database and migrations
+    # Initialize database
     db.init_app(app)
-    migrate = Migrate(app, db)
+    
+    # Migrations are only wired up for the `flask db` CLI (or when forced via
+    # FLASK_MIGRATE=1), so request-serving workers skip importing Alembic
+    if os.environ.get("FLASK_MIGRATE") == "1" or running_flask_cli():
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    
+    # Log lazy loads (possible N+1 regressions) in debug mode or when asked to
+    if app.debug or os.environ.get("SPYENGINE_LOG_LAZY_LOADS") == "1":
+        log_lazy_loads(db.session)
     
     # CORS configuration
     CORS(app, resources={
@@ -48,8 +95,11 @@ def create_app():
     app.register_blueprint(main_bp)
     app.register_blueprint(unity_api, url_prefix='/api/unity')
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    # Create database tables only when explicitly requested (e.g. local
+    # bootstrap); schema changes in deployed environments go through
+    # `flask db upgrade`
+    if os.environ.get("SPYENGINE_AUTO_CREATE_TABLES") == "1":
+        with app.app_context():
+            db.create_all()
     
     return app
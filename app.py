@@ -4,13 +4,16 @@ SpyEngine API Server
 A minimal FastAPI server that exposes the SpyEngine backend functionality to the frontend.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 from pydantic import BaseModel
 from typing import Dict, List, Optional, Any, Tuple
+import itertools
 import json
 import logging
+import orjson
 import random
 
 # Configure logging
@@ -18,7 +21,11 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
-app = FastAPI(title="SpyEngine API", description="API for SpyEngine frontend integration")
+app = FastAPI(
+    title="SpyEngine API",
+    description="API for SpyEngine frontend integration",
+    default_response_class=ORJSONResponse
+)
 
 # Configure CORS for local development
 app.add_middleware(
@@ -114,6 +121,15 @@ CURRENCY_TYPES = {
     "💵": "Dollar"
 }
 
+# --- Static response bodies, serialized once at import time ---
+ROOT_JSON = orjson.dumps({"message": "SpyEngine API is running"})
+STORY_OPTIONS_JSON = orjson.dumps(STORY_OPTIONS)
+INITIAL_STATE_JSON = orjson.dumps({
+    "currency_balances": DEFAULT_CURRENCY_BALANCES,
+    "story_text": None,
+    "choices": []
+})
+
 # --- Pydantic models ---
 class StoryOptions(BaseModel):
     conflicts: List[Tuple[str, str]]
@@ -176,26 +192,27 @@ MOCK_CHARACTERS = [
     }
 ]
 
-# --- Mock story generation (since actual generation requires OpenAI and complex dependencies) ---
-def mock_generate_story(
-    conflict,
-    setting,
-    narrative_style,
-    mood,
-    protagonist_name,
-    protagonist_gender,
-    character_info=None,
-    additional_characters=None,
-    **kwargs
-):
-    """A mock implementation of story generation for development purposes"""
-    
-    # Create a reasonable narrative that includes the parameters provided
-    narrative = f"""You are {protagonist_name}, a skilled operative drawn into a web of {conflict.lower()} in {setting}. 
+# --- Characters partitioned by role, computed once at import time ---
+MISSION_GIVERS = [c for c in MOCK_CHARACTERS if c["role"] == "mission-giver"]
+VILLAINS = [c for c in MOCK_CHARACTERS if c["role"] == "villain"]
+OTHER_CHARACTERS = [c for c in MOCK_CHARACTERS if c["role"] not in ("mission-giver", "villain")]
+
+# --- Pre-serialized random character samples, cycled per requested count ---
+CHARACTER_SAMPLE_VARIANTS = 16
+CHARACTER_SAMPLE_POOLS = {
+    count: itertools.cycle([
+        orjson.dumps(random.sample(MOCK_CHARACTERS, count))
+        for _ in range(CHARACTER_SAMPLE_VARIANTS)
+    ])
+    for count in range(len(MOCK_CHARACTERS) + 1)
+}
+
+# --- Mock story text, formatted per request with %-style substitution ---
+MOCK_NARRATIVE_TEMPLATE = """You are %(protagonist_name)s, a skilled operative drawn into a web of %(conflict)s in %(setting)s. 
     
 The room is dimly lit as Evelyn Fox slides a manila folder across the weathered oak table. Her expression is stern, tinged with that familiar exasperation you've come to expect.
 
-"Listen carefully, {protagonist_name}," she says, adjusting her glasses. "Viktor Dragunov has obtained schematics for an AI-powered weapons system that could destabilize the entire North Atlantic security framework. The geopolitical implications alone would trigger a paradigm shift in how we approach multilateral defense treaties."
+"Listen carefully, %(protagonist_name)s," she says, adjusting her glasses. "Viktor Dragunov has obtained schematics for an AI-powered weapons system that could destabilize the entire North Atlantic security framework. The geopolitical implications alone would trigger a paradigm shift in how we approach multilateral defense treaties."
 
 You stifle a yawn as she continues her lecture on international relations. Same old Fox - brilliant but unable to get to the point.
 
@@ -211,21 +228,44 @@ Alternatively, there are rumors that Svetlana Petrova, a skilled hacker who esca
 
 You check your equipment and consider the resources at your disposal. Time is ticking."""
 
+MOCK_STORY_CHOICES = [
+    {
+        "choice_id": "1",
+        "text": "Visit Maximilian Zhou at The Golden Dragon nightclub to gather intelligence on Dragunov's security systems"
+    },
+    {
+        "choice_id": "2",
+        "text": "Track down Svetlana Petrova for her insider knowledge of Dragunov's operations"
+    },
+    {
+        "choice_id": "3",
+        "text": "Conduct your own reconnaissance of Dragunov's known headquarters before making contact with any potential allies"
+    }
+]
+
+# --- Mock story generation (since actual generation requires OpenAI and complex dependencies) ---
+def mock_generate_story(
+    conflict,
+    setting,
+    narrative_style,
+    mood,
+    protagonist_name,
+    protagonist_gender,
+    character_info=None,
+    additional_characters=None,
+    **kwargs
+):
+    """A mock implementation of story generation for development purposes"""
+    
+    # Create a reasonable narrative that includes the parameters provided
+    narrative = MOCK_NARRATIVE_TEMPLATE % {
+        "protagonist_name": protagonist_name,
+        "conflict": conflict.lower(),
+        "setting": setting
+    }
+
     # Generate three choices that make sense for the story
-    choices = [
-        {
-            "choice_id": "1",
-            "text": f"Visit Maximilian Zhou at The Golden Dragon nightclub to gather intelligence on Dragunov's security systems"
-        },
-        {
-            "choice_id": "2",
-            "text": f"Track down Svetlana Petrova for her insider knowledge of Dragunov's operations"
-        },
-        {
-            "choice_id": "3",
-            "text": f"Conduct your own reconnaissance of Dragunov's known headquarters before making contact with any potential allies"
-        }
-    ]
+    choices = MOCK_STORY_CHOICES
     
     return {
         "narrative_text": narrative,
@@ -236,52 +276,87 @@ You check your equipment and consider the resources at your disposal. Time is ti
         "mood": mood
     }
 
+# --- Mock story continuations, keyed by choice_id ---
+ZHOU_NARRATIVE = "You decide to visit Maximilian Zhou at The Golden Dragon nightclub. The neon-lit establishment pulses with energy as you make your way through the crowd. Zhou spots you from his private booth and waves you over, his expression revealing nothing about his intentions."
+ZHOU_CHOICES = [
+    {"choice_id": "4", "text": "Ask directly about Dragunov's security systems"},
+    {"choice_id": "5", "text": "Play it cool, order drinks and ease into the conversation"},
+    {"choice_id": "6", "text": "Offer Zhou a substantial payment for information"}
+]
+
+PETROVA_NARRATIVE = "You begin the challenging task of tracking down Svetlana Petrova. After calling in several favors and following a trail of digital breadcrumbs, you find yourself at an abandoned warehouse that's been converted into a hacker's paradise. Petrova regards you suspiciously from behind a wall of monitors."
+PETROVA_CHOICES = [
+    {"choice_id": "7", "text": "Appeal to her desire for revenge against Dragunov"},
+    {"choice_id": "8", "text": "Offer technical equipment and resources in exchange for help"},
+    {"choice_id": "9", "text": "Be honest about the mission and the stakes"}
+]
+
+RECON_NARRATIVE = "You decide to conduct your own reconnaissance before involving potential allies. Under cover of darkness, you approach one of Dragunov's known facilities. The compound is heavily guarded, but you notice a potential vulnerability in the patrol patterns."
+RECON_CHOICES = [
+    {"choice_id": "10", "text": "Attempt to infiltrate now while you have the element of surprise"},
+    {"choice_id": "11", "text": "Document your findings and seek Maximilian Zhou's help"},
+    {"choice_id": "12", "text": "Look for Petrova to help you exploit the digital security"}
+]
+
+CHOICE_TABLE: Dict[str, Tuple[str, List[Dict[str, str]]]] = {
+    "1": (ZHOU_NARRATIVE, ZHOU_CHOICES),
+    "2": (PETROVA_NARRATIVE, PETROVA_CHOICES),
+    "3": (RECON_NARRATIVE, RECON_CHOICES),
+}
+
+def _choice_response(entry: Tuple[str, List[Dict[str, str]]]) -> bytes:
+    """Serialize a continuation table entry into a complete response body."""
+    narrative, choices = entry
+    return orjson.dumps({
+        "narrative_text": narrative,
+        "choices": choices,
+        "currency_balances": DEFAULT_CURRENCY_BALANCES
+    })
+
+CHOICE_RESPONSES = {choice_id: _choice_response(entry) for choice_id, entry in CHOICE_TABLE.items()}
+# Any unknown choice falls through to the reconnaissance branch
+DEFAULT_CHOICE_RESPONSE = CHOICE_RESPONSES["3"]
+
 # --- API Routes ---
 @app.get("/")
 async def root():
-    return {"message": "SpyEngine API is running"}
+    return Response(ROOT_JSON, media_type="application/json")
 
-@app.get("/api/v1/story_options", response_model=Dict[str, List[Tuple[str, str]]])
+@app.get("/api/v1/story_options")
 async def story_options():
     """Get all available story options for UI display."""
-    return STORY_OPTIONS
+    return Response(STORY_OPTIONS_JSON, media_type="application/json")
 
 @app.get("/api/v1/characters")
-async def get_random_characters(count: int = 3):
+async def get_random_characters(count: int = Query(3, ge=0)):
     """Get random characters from the database (mocked for now)."""
     # In a real implementation, this would pull from the database
     if count > len(MOCK_CHARACTERS):
         count = len(MOCK_CHARACTERS)
-    return random.sample(MOCK_CHARACTERS, count)
+    return Response(next(CHARACTER_SAMPLE_POOLS[count]), media_type="application/json")
 
 @app.get("/api/v1/state")
 async def get_initial_state():
     """Get initial game state with default currency balances."""
-    return {
-        "currency_balances": DEFAULT_CURRENCY_BALANCES,
-        "story_text": None,
-        "choices": []
-    }
+    return Response(INITIAL_STATE_JSON, media_type="application/json")
 
 @app.post("/api/v1/generate_story")
 async def create_story(request: StoryRequest):
     """Generate a new story based on user selections."""
+    # Ensure we have a mission-giver and villain
+    if not MISSION_GIVERS or not VILLAINS:
+        raise HTTPException(status_code=500, detail="Required character roles not found")
+    
+    # Get characters from the role pools (would be from database in production)
+    mission_giver = MISSION_GIVERS[0]
+    villain = VILLAINS[0]
+    
+    # Select additional characters
+    additional_chars = random.sample(OTHER_CHARACTERS, min(2, len(OTHER_CHARACTERS)))
+    all_chars = [mission_giver] + [villain] + additional_chars
+    
+    # Generate story (mocked for now without OpenAI)
     try:
-        # Get random characters (would be from database in production)
-        char_pool = MOCK_CHARACTERS
-        mission_giver = next((c for c in char_pool if c["role"] == "mission-giver"), None)
-        villain = next((c for c in char_pool if c["role"] == "villain"), None)
-        others = [c for c in char_pool if c["role"] not in ["mission-giver", "villain"]]
-        
-        # Ensure we have a mission-giver and villain
-        if not mission_giver or not villain:
-            raise HTTPException(status_code=500, detail="Required character roles not found")
-        
-        # Select additional characters
-        additional_chars = random.sample(others, min(2, len(others)))
-        all_chars = [mission_giver] + [villain] + additional_chars
-        
-        # Generate story (mocked for now without OpenAI)
         story_data = mock_generate_story(
             conflict=request.conflict,
             setting=request.setting,
@@ -297,57 +372,24 @@ async def create_story(request: StoryRequest):
             character_info=mission_giver,
             additional_characters=[villain] + additional_chars
         )
-        
-        # Return data with characters and currency balances
-        response = {
-            "story_data": story_data,
-            "currency_balances": DEFAULT_CURRENCY_BALANCES,
-            "characters": all_chars
-        }
-        
-        return response
-    
     except Exception as e:
-        logger.error(f"Error generating story: {str(e)}")
+        logger.error("Error generating story: %s", e)
         raise HTTPException(status_code=500, detail=f"Story generation failed: {str(e)}")
+    
+    # Return data with characters and currency balances
+    return {
+        "story_data": story_data,
+        "currency_balances": DEFAULT_CURRENCY_BALANCES,
+        "characters": all_chars
+    }
 
 @app.post("/api/v1/choice")
 async def make_choice(request: ChoiceRequest):
     """Process a user's choice in the story."""
     # This would connect to GameEngine.make_choice() in a full implementation
-    try:
-        # Generate a continuation based on the choice
-        if request.choice_id == "1":
-            narrative = "You decide to visit Maximilian Zhou at The Golden Dragon nightclub. The neon-lit establishment pulses with energy as you make your way through the crowd. Zhou spots you from his private booth and waves you over, his expression revealing nothing about his intentions."
-            choices = [
-                {"choice_id": "4", "text": "Ask directly about Dragunov's security systems"},
-                {"choice_id": "5", "text": "Play it cool, order drinks and ease into the conversation"},
-                {"choice_id": "6", "text": "Offer Zhou a substantial payment for information"}
-            ]
-        elif request.choice_id == "2":
-            narrative = "You begin the challenging task of tracking down Svetlana Petrova. After calling in several favors and following a trail of digital breadcrumbs, you find yourself at an abandoned warehouse that's been converted into a hacker's paradise. Petrova regards you suspiciously from behind a wall of monitors."
-            choices = [
-                {"choice_id": "7", "text": "Appeal to her desire for revenge against Dragunov"},
-                {"choice_id": "8", "text": "Offer technical equipment and resources in exchange for help"},
-                {"choice_id": "9", "text": "Be honest about the mission and the stakes"}
-            ]
-        else:
-            narrative = "You decide to conduct your own reconnaissance before involving potential allies. Under cover of darkness, you approach one of Dragunov's known facilities. The compound is heavily guarded, but you notice a potential vulnerability in the patrol patterns."
-            choices = [
-                {"choice_id": "10", "text": "Attempt to infiltrate now while you have the element of surprise"},
-                {"choice_id": "11", "text": "Document your findings and seek Maximilian Zhou's help"},
-                {"choice_id": "12", "text": "Look for Petrova to help you exploit the digital security"}
-            ]
-        
-        # Return the continuation
-        return {
-            "narrative_text": narrative,
-            "choices": choices,
-            "currency_balances": DEFAULT_CURRENCY_BALANCES
-        }
-    except Exception as e:
-        logger.error(f"Error processing choice: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Choice processing failed: {str(e)}")
+    # Look up the prebuilt continuation for the choice
+    body = CHOICE_RESPONSES.get(request.choice_id, DEFAULT_CHOICE_RESPONSE)
+    return Response(body, media_type="application/json")
 
 if __name__ == "__main__":
     uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
@@ -2,24 +2,69 @@
 # This file makes the 'app' directory a Python package.
 # It defines the FastAPI application factory and a health-check route.
 
-from fastapi import FastAPI
+import logging
+import os
+import orjson
+from fastapi import FastAPI, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Health-check body, serialized once at import time
+HEALTH_JSON = orjson.dumps({"status": "ok", "message": "SpyEngine API is healthy"})
 
 def create_app():
     """Create and configure an instance of the FastAPI application."""
     app = FastAPI(
         title="SpyEngine API",
         description="API for the Spy Story Game Engine",
-        version="0.1.0"
+        version="0.1.0",
+        default_response_class=ORJSONResponse
     )
 
     @app.get("/health", tags=["Health"])
     async def health_check():
         """Perform a health check."""
-        return {"status": "ok", "message": "SpyEngine API is healthy"}
+        return Response(HEALTH_JSON, media_type="application/json")
+
+    @app.exception_handler(Exception)
+    async def handle_unexpected_error(request: Request, exc: Exception):
+        """Return uncaught handler errors in the API's standard error shape."""
+        logger.error("Error handling %s %s: %s", request.method, request.url.path, exc)
+        return ORJSONResponse(status_code=500, content={
+            "status": "error",
+            "message": str(exc)
+        })
+
+    @app.exception_handler(RequestValidationError)
+    async def handle_validation_error(request: Request, exc: RequestValidationError):
+        """Report invalid request bodies with the 400 error shape of the former Flask API."""
+        for error in exc.errors():
+            if error.get("type") == "json_invalid":
+                message = f"Invalid JSON format: {error.get('msg')}"
+                break
+        else:
+            message = "Missing required parameters"
+        return ORJSONResponse(status_code=400, content={
+            "status": "error",
+            "message": message
+        })
+
+    # Register API routers. The game router imports UserProgress, StoryGeneration,
+    # StoryNode and Mission from app.models and `db` from app.db; until those
+    # placeholders are filled in (task 3.4) the app starts without it
+    try:
+        from .api.v1 import game_api
+    except ImportError as e:
+        logger.warning("Game API not mounted, its dependencies are unavailable: %s", e)
+    else:
+        app.include_router(game_api.router, prefix="/api/v1")
 
-    # Future: Register API routers here
-    # from .api.v1 import endpoints as v1_endpoints
-    # app.include_router(v1_endpoints.router, prefix="/api/v1")
+    # Opt-in trie-indexed route matching; the stock linear scan stays the default
+    if os.environ.get("SPYENGINE_TRIE_ROUTER") == "1":
+        from .api.routing import install_trie_router
+        install_trie_router(app)
 
     return app
 
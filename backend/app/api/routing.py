@@ -0,0 +1,133 @@
+"""
+Trie-indexed request routing for the FastAPI app.
+
+Starlette resolves a request by calling `matches()` on every registered route
+in order. TrieRouter indexes routes by path segment so only routes whose static
+segments fit the request path are tried, still in registration order. Anything
+the index cannot resolve (no full match, method mismatch, trailing-slash
+redirects, root paths, lifespan events) falls through to the stock linear scan,
+so responses are identical with or without the index.
+"""
+
+import threading
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+from fastapi import APIRouter, FastAPI
+from starlette.routing import BaseRoute, Match, Route, WebSocketRoute
+from starlette.types import Receive, Scope, Send
+
+# Trie key for a `{param}` path segment, which matches any single segment
+PARAM_SEGMENT = "*"
+
+# Serializes index rebuilds across threads (e.g. TestClient or threaded servers)
+_INDEX_LOCK = threading.Lock()
+
+class _TrieNode:
+    """One path segment in the route index."""
+    __slots__ = ("children", "routes")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.routes: List[Tuple[int, BaseRoute]] = []
+
+# Route count the index was built from, its trie root, and the routes kept out of it
+_TrieIndex = Tuple[int, _TrieNode, Tuple[Tuple[int, BaseRoute], ...]]
+
+def _split_path(path: str) -> List[str]:
+    """Split an absolute URL path into segments ("/" -> [""])."""
+    return path[1:].split("/")
+
+def _is_indexable(route: BaseRoute) -> bool:
+    """Routes with a fixed segment count can be indexed; mounts and `:path` params cannot."""
+    return (
+        isinstance(route, (Route, WebSocketRoute))
+        and route.path.startswith("/")
+        and ":path}" not in route.path
+    )
+
+class TrieRouter(APIRouter):
+    """
+    APIRouter that narrows route matching with a prefix tree of path segments.
+
+    The index is rebuilt lazily whenever the route list changes length, so
+    routes registered after installation are picked up automatically.
+    Routes that cannot be indexed are always kept as candidates.
+    """
+
+    # Replaced as a whole on rebuild so readers never see a half-built index. Set
+    # on the instance at first use, as install_trie_router skips __init__
+    _trie_index: Optional[_TrieIndex] = None
+
+    def _get_index(self) -> _TrieIndex:
+        """Return the route index, rebuilding it if routes were added since it was built."""
+        index = self._trie_index
+        if index is None or index[0] != len(self.routes):
+            with _INDEX_LOCK:
+                index = self._trie_index
+                if index is None or index[0] != len(self.routes):
+                    index = self._build_index()
+                    self._trie_index = index
+        return index
+
+    def _build_index(self) -> _TrieIndex:
+        routes = list(self.routes)
+        root = _TrieNode()
+        unindexed = []
+        for position, route in enumerate(routes):
+            if not _is_indexable(route):
+                unindexed.append((position, route))
+                continue
+            node = root
+            for segment in _split_path(route.path):
+                key = PARAM_SEGMENT if "{" in segment else segment
+                node = node.children.setdefault(key, _TrieNode())
+            node.routes.append((position, route))
+        return len(routes), root, tuple(unindexed)
+
+    def _candidates(self, path: str) -> List[BaseRoute]:
+        """Routes that may match `path`, in registration order."""
+        _, root, unindexed = self._get_index()
+
+        nodes = [root]
+        for segment in _split_path(path):
+            next_nodes = []
+            for node in nodes:
+                child = node.children.get(segment)
+                if child is not None:
+                    next_nodes.append(child)
+                child = node.children.get(PARAM_SEGMENT)
+                if child is not None:
+                    next_nodes.append(child)
+            if not next_nodes:
+                nodes = []
+                break
+            nodes = next_nodes
+
+        found = [entry for node in nodes for entry in node.routes]
+        if unindexed:
+            found.extend(unindexed)
+            found.sort(key=itemgetter(0))
+        elif len(nodes) > 1:
+            found.sort(key=itemgetter(0))
+        return [route for _, route in found]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket") and scope["path"].startswith("/"):
+            for route in self._candidates(scope["path"]):
+                match, child_scope = route.matches(scope)
+                if match == Match.FULL:
+                    if "router" not in scope:
+                        scope["router"] = self
+                    scope.update(child_scope)
+                    await route.handle(scope, receive, send)
+                    return
+        await super().__call__(scope, receive, send)
+
+def install_trie_router(app: FastAPI):
+    """
+    Switch an app's router to TrieRouter in place.
+
+    The existing router instance is kept (only its class changes) so its
+    routes, lifespan handlers and FastAPI defaults carry over unchanged.
+    """
+    app.router.__class__ = TrieRouter
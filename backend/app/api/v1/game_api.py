@@ -1,314 +1,244 @@
 import logging
-from flask import Blueprint, jsonify, request, session
-from services.game_engine import GameEngine
-from models import UserProgress, Mission
-from database import db
+from operator import attrgetter
+from typing import FrozenSet, Optional, Tuple, Union
+import orjson
+from fastapi import APIRouter, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from ...core.game_engine import GameEngine
+from ...models import UserProgress, Mission
+from ...db import db
 
 logger = logging.getLogger(__name__)
 
-# Create Blueprint
-game_api = Blueprint('game_api', __name__)
+# Create router; handlers are plain `def` so FastAPI runs their blocking
+# database and engine calls in its threadpool instead of on the event loop
+router = APIRouter(tags=["Game"])
 
-@game_api.route('/state/<user_id>', methods=['GET'])
-def get_game_state(user_id):
+class StartStoryRequest(BaseModel):
+    """Request body for starting a new story; numeric text fields are coerced to strings."""
+    model_config = ConfigDict(str_strip_whitespace=True, coerce_numbers_to_str=True)
+
+    user_id: str = Field(min_length=1)
+    conflict: str = Field(min_length=1)
+    setting: str = Field(min_length=1)
+    narrative_style: str = Field(min_length=1)
+    mood: str = Field(min_length=1)
+    character_id: Optional[Union[int, str]] = None
+    custom_conflict: Optional[str] = None
+    custom_setting: Optional[str] = None
+    custom_narrative: Optional[str] = None
+    custom_mood: Optional[str] = None
+
+class MakeChoiceRequest(BaseModel):
+    """Request body for making a story choice."""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    user_id: str = Field(min_length=1)
+    choice_id: str = Field(min_length=1)
+    custom_choice_text: Optional[str] = None
+
+class UpdateMissionRequest(BaseModel):
+    """Request body for completing or failing a mission."""
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    user_id: str = Field(min_length=1)
+    mission_id: Union[int, str]
+    status: str = Field(min_length=1)  # 'complete' or 'fail'
+    reason: Optional[str] = None
+
+# Mission fields serialized by get_missions; closed missions report status instead of progress
+ACTIVE_MISSION_FIELDS = (
+    'id',
+    'title',
+    'description',
+    'objective',
+    'progress',
+    'reward_currency',
+    'reward_amount',
+    'difficulty'
+)
+CLOSED_MISSION_FIELDS = (
+    'id',
+    'title',
+    'description',
+    'objective',
+    'status',
+    'reward_currency',
+    'reward_amount',
+    'difficulty'
+)
+get_active_mission_fields = attrgetter(*ACTIVE_MISSION_FIELDS)
+get_closed_mission_fields = attrgetter(*CLOSED_MISSION_FIELDS)
+
+# Placeholder active missions, serialized once at import time
+ACTIVE_MISSIONS_JSON = orjson.dumps({
+    "status": "success",
+    "missions": [
+        {
+            "id": 1,
+            "title": "Infiltrate Enemy Base",
+            "description": "Gather intelligence from a secure facility",
+            "status": "active",
+            "progress": 0.5,
+            "rewards": {
+                "currency": "intel_points",
+                "amount": 500
+            }
+        },
+        {
+            "id": 2,
+            "title": "Decode Encrypted Message",
+            "description": "Break the enemy's communication cipher",
+            "status": "active",
+            "progress": 0.2,
+            "rewards": {
+                "currency": "intel_points",
+                "amount": 300
+            }
+        }
+    ]
+})
+
+def get_mission_id_sets(user_id: str) -> Optional[Tuple[FrozenSet[int], FrozenSet[int], FrozenSet[int]]]:
+    """Return the user's (active, completed, failed) mission ID sets, or None if the user has no progress record."""
+    # Only the three ID-list columns are needed, not the whole progress record
+    row = UserProgress.query.with_entities(
+        UserProgress.active_missions,
+        UserProgress.completed_missions,
+        UserProgress.failed_missions
+    ).filter_by(user_id=user_id).first()
+    if not row:
+        return None
+
+    return (
+        frozenset(row.active_missions or []),
+        frozenset(row.completed_missions or []),
+        frozenset(row.failed_missions or [])
+    )
+
+@router.get('/state/{user_id}')
+def get_game_state(user_id: str):
     """Get the current game state for a user"""
-    try:
-        game_state = GameEngine.get_game_state(user_id)
-        return jsonify({
-            "status": "success",
-            "data": game_state.to_dict()
-        })
-    except Exception as e:
-        logger.error(f"Error getting game state: {str(e)}")
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
+    game_state = GameEngine.get_game_state(user_id)
+    return {
+        "status": "success",
+        "data": game_state.to_dict()
+    }
 
-@game_api.route('/story/start', methods=['POST'])
-def start_story():
+@router.post('/story/start')
+def start_story(story_request: StartStoryRequest):
     """Start a new story"""
-    try:
-        # Validate incoming JSON
-        try:
-            data = request.get_json(force=True)
-            if data is None:
-                logger.error("Invalid JSON received: None")
-                return jsonify({
-                    "status": "error",
-                    "message": "Invalid JSON data received"
-                }), 400
-        except Exception as e:
-            logger.error(f"Error parsing JSON: {str(e)}")
-            return jsonify({
-                "status": "error",
-                "message": f"Invalid JSON format: {str(e)}"
-            }), 400
-        
-        # Extract fields with validation
-        user_id = data.get('user_id')
-        conflict = data.get('conflict')
-        setting = data.get('setting')
-        narrative_style = data.get('narrative_style')
-        mood = data.get('mood')
-        character_id = data.get('character_id')
-        custom_conflict = data.get('custom_conflict')
-        custom_setting = data.get('custom_setting') 
-        custom_narrative = data.get('custom_narrative')
-        custom_mood = data.get('custom_mood')
-        
-        # Ensure text fields are properly encoded strings
-        for field_name, field_value in [
-            ('conflict', conflict),
-            ('setting', setting),
-            ('narrative_style', narrative_style),
-            ('mood', mood),
-            ('custom_conflict', custom_conflict),
-            ('custom_setting', custom_setting),
-            ('custom_narrative', custom_narrative),
-            ('custom_mood', custom_mood)
-        ]:
-            if field_value is not None and not isinstance(field_value, str):
-                logger.warning(f"Field {field_name} has unexpected type: {type(field_value)}")
-                # Convert to string
-                data[field_name] = str(field_value)
-        
-        # Update variable values after potential conversion
-        conflict = data.get('conflict')
-        setting = data.get('setting')
-        narrative_style = data.get('narrative_style')
-        mood = data.get('mood')
-        custom_conflict = data.get('custom_conflict')
-        custom_setting = data.get('custom_setting')
-        custom_narrative = data.get('custom_narrative')
-        custom_mood = data.get('custom_mood')
-        
-        # Validate required parameters
-        if not all([user_id, conflict, setting, narrative_style, mood]):
-            return jsonify({
-                "status": "error",
-                "message": "Missing required parameters"
-            }), 400
-        
-        # Start new story
-        story_data, game_state = GameEngine.start_new_story(
-            user_id=user_id,
-            conflict=conflict,
-            setting=setting,
-            narrative_style=narrative_style,
-            mood=mood,
-            character_id=character_id,
-            custom_conflict=custom_conflict,
-            custom_setting=custom_setting,
-            custom_narrative=custom_narrative,
-            custom_mood=custom_mood
-        )
-        
-        return jsonify({
-            "status": "success",
-            "story": story_data,
-            "game_state": game_state.to_dict()
-        })
-    except Exception as e:
-        logger.error(f"Error starting story: {str(e)}")
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
+    # Start new story
+    story_data, game_state = GameEngine.start_new_story(
+        user_id=story_request.user_id,
+        conflict=story_request.conflict,
+        setting=story_request.setting,
+        narrative_style=story_request.narrative_style,
+        mood=story_request.mood,
+        character_id=story_request.character_id,
+        custom_conflict=story_request.custom_conflict,
+        custom_setting=story_request.custom_setting,
+        custom_narrative=story_request.custom_narrative,
+        custom_mood=story_request.custom_mood
+    )
+
+    return {
+        "status": "success",
+        "story": story_data,
+        "game_state": game_state.to_dict()
+    }
 
-@game_api.route('/story/choice', methods=['POST'])
-def make_choice():
+@router.post('/story/choice')
+def make_choice(choice_request: MakeChoiceRequest):
     """Make a story choice"""
     try:
-        data = request.json
-        user_id = data.get('user_id')
-        choice_id = data.get('choice_id')
-        custom_choice_text = data.get('custom_choice_text')
-        
-        # Validate required parameters
-        if not all([user_id, choice_id]):
-            return jsonify({
-                "status": "error",
-                "message": "Missing required parameters"
-            }), 400
-        
         # Process choice
         story_data, game_state = GameEngine.make_choice(
-            user_id=user_id,
-            choice_id=choice_id,
-            custom_choice_text=custom_choice_text
+            user_id=choice_request.user_id,
+            choice_id=choice_request.choice_id,
+            custom_choice_text=choice_request.custom_choice_text
         )
-        
-        return jsonify({
-            "status": "success",
-            "story_continuation": story_data,
-            "game_state": game_state.to_dict()
-        })
     except ValueError as e:
-        logger.error(f"Error with choice: {str(e)}")
-        return jsonify({
+        logger.error("Error with choice: %s", e)
+        return ORJSONResponse(status_code=400, content={
             "status": "error",
             "message": str(e)
-        }), 400
-    except Exception as e:
-        logger.error(f"Error processing choice: {str(e)}")
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
-
-@game_api.route('/missions/<user_id>', methods=['GET'])
-def get_missions(user_id):
-    """Get all missions for a user"""
-    try:
-        # Get user progress
-        user_progress = UserProgress.query.filter_by(user_id=user_id).first()
-        if not user_progress:
-            return jsonify({
-                "status": "error",
-                "message": "User not found"
-            }), 404
-        
-        # Get active missions
-        active_missions = Mission.query.filter(
-            Mission.id.in_(user_progress.active_missions) if user_progress.active_missions else [],
-            Mission.user_id == user_id
-        ).all()
-        
-        # Get completed missions
-        completed_missions = Mission.query.filter(
-            Mission.id.in_(user_progress.completed_missions) if user_progress.completed_missions else [],
-            Mission.user_id == user_id
-        ).all()
-        
-        # Get failed missions
-        failed_missions = Mission.query.filter(
-            Mission.id.in_(user_progress.failed_missions) if user_progress.failed_missions else [],
-            Mission.user_id == user_id
-        ).all()
-        
-        return jsonify({
-            "status": "success",
-            "active_missions": [
-                {
-                    "id": mission.id,
-                    "title": mission.title,
-                    "description": mission.description,
-                    "objective": mission.objective,
-                    "progress": mission.progress,
-                    "reward_currency": mission.reward_currency,
-                    "reward_amount": mission.reward_amount,
-                    "difficulty": mission.difficulty
-                } for mission in active_missions
-            ],
-            "completed_missions": [
-                {
-                    "id": mission.id,
-                    "title": mission.title,
-                    "description": mission.description,
-                    "objective": mission.objective,
-                    "status": mission.status,
-                    "reward_currency": mission.reward_currency,
-                    "reward_amount": mission.reward_amount,
-                    "difficulty": mission.difficulty
-                } for mission in completed_missions
-            ],
-            "failed_missions": [
-                {
-                    "id": mission.id,
-                    "title": mission.title,
-                    "description": mission.description,
-                    "objective": mission.objective,
-                    "status": mission.status,
-                    "reward_currency": mission.reward_currency,
-                    "reward_amount": mission.reward_amount,
-                    "difficulty": mission.difficulty
-                } for mission in failed_missions
-            ]
         })
-    except Exception as e:
-        logger.error(f"Error getting missions: {str(e)}")
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
 
-@game_api.route('/missions/active', methods=['GET'])
+    return {
+        "status": "success",
+        "story_continuation": story_data,
+        "game_state": game_state.to_dict()
+    }
+
+# Registered before /missions/{user_id} so "active" is not captured as a user ID
+@router.get('/missions/active')
 def get_active_missions():
     """Get all active missions for current user"""
-    try:
-        # Get user ID from session
-        user_id = session.get('user_id', 'default_user')
-        
-        # Fetch active missions 
-        active_missions = [
-            {
-                "id": 1,
-                "title": "Infiltrate Enemy Base",
-                "description": "Gather intelligence from a secure facility",
-                "status": "active",
-                "progress": 0.5,
-                "rewards": {
-                    "currency": "intel_points",
-                    "amount": 500
-                }
-            },
-            {
-                "id": 2,
-                "title": "Decode Encrypted Message",
-                "description": "Break the enemy's communication cipher",
-                "status": "active", 
-                "progress": 0.2,
-                "rewards": {
-                    "currency": "intel_points", 
-                    "amount": 300
-                }
-            }
-        ]
-        
-        return jsonify({
-            "status": "success",
-            "missions": active_missions
-        })
-    except Exception as e:
-        logger.error(f"Error fetching active missions: {str(e)}")
-        return jsonify({
+    return Response(ACTIVE_MISSIONS_JSON, media_type="application/json")
+
+@router.get('/missions/{user_id}')
+def get_missions(user_id: str):
+    """Get all missions for a user"""
+    # Get the user's mission ID lists
+    id_sets = get_mission_id_sets(user_id)
+    if id_sets is None:
+        return ORJSONResponse(status_code=404, content={
             "status": "error",
-            "message": str(e)
-        }), 500
+            "message": "User not found"
+        })
+
+    active_ids, completed_ids, failed_ids = id_sets
+
+    # Fetch all of the user's missions in one query, then partition by list
+    active_missions = []
+    completed_missions = []
+    failed_missions = []
+    all_ids = active_ids | completed_ids | failed_ids
+    if all_ids:
+        rows = db.session.query(
+            Mission.id,
+            Mission.title,
+            Mission.description,
+            Mission.objective,
+            Mission.progress,
+            Mission.status,
+            Mission.reward_currency,
+            Mission.reward_amount,
+            Mission.difficulty
+        ).filter(
+            Mission.user_id == user_id,
+            Mission.id.in_(all_ids)
+        ).all()
+
+        for row in rows:
+            if row.id in active_ids:
+                active_missions.append(dict(zip(ACTIVE_MISSION_FIELDS, get_active_mission_fields(row))))
+            if row.id in completed_ids:
+                completed_missions.append(dict(zip(CLOSED_MISSION_FIELDS, get_closed_mission_fields(row))))
+            if row.id in failed_ids:
+                failed_missions.append(dict(zip(CLOSED_MISSION_FIELDS, get_closed_mission_fields(row))))
+
+    return {
+        "status": "success",
+        "active_missions": active_missions,
+        "completed_missions": completed_missions,
+        "failed_missions": failed_missions
+    }
 
-@game_api.route('/mission/update', methods=['POST'])
-def update_mission():
+@router.post('/mission/update')
+def update_mission(mission_request: UpdateMissionRequest):
     """Update a mission's status"""
-    try:
-        data = request.json
-        user_id = data.get('user_id')
-        mission_id = data.get('mission_id')
-        status = data.get('status')  # 'complete' or 'fail'
-        reason = data.get('reason')
-        
-        # Validate required parameters
-        if not all([user_id, mission_id, status]):
-            return jsonify({
-                "status": "error",
-                "message": "Missing required parameters"
-            }), 400
-        
-        # Update mission status
-        game_state = GameEngine.update_mission_status(
-            user_id=user_id,
-            mission_id=mission_id,
-            status=status,
-            reason=reason
-        )
-        
-        return jsonify({
-            "status": "success",
-            "game_state": game_state.to_dict()
-        })
-    except Exception as e:
-        logger.error(f"Error updating mission: {str(e)}")
-        return jsonify({
-            "status": "error",
-            "message": str(e)
-        }), 500
+    # Update mission status
+    game_state = GameEngine.update_mission_status(
+        user_id=mission_request.user_id,
+        mission_id=mission_request.mission_id,
+        status=mission_request.status,
+        reason=mission_request.reason
+    )
+
+    return {
+        "status": "success",
+        "game_state": game_state.to_dict()
+    }
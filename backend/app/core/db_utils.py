@@ -0,0 +1,27 @@
+"""
+Database session helpers for the game engine.
+"""
+
+from contextlib import contextmanager
+from sqlalchemy.orm import scoped_session
+
+@contextmanager
+def no_expire_on_commit(session):
+    """
+    Keep ORM instances loaded across commits made inside the block.
+
+    By default a commit expires every instance in the session, so reading
+    attributes afterwards (e.g. to build a response) re-SELECTs each row.
+    Use this only where the committed values are known to be current.
+
+    Args:
+        session: A Session or scoped_session (such as db.session)
+    """
+    if isinstance(session, scoped_session):
+        session = session()
+    previous = session.expire_on_commit
+    session.expire_on_commit = False
+    try:
+        yield session
+    finally:
+        session.expire_on_commit = previous
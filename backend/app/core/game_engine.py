@@ -31,12 +31,18 @@ Dependencies:
 """
 
 import logging
-from typing import Dict, Any, Optional, List
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, timedelta
+from sqlalchemy import and_, case, update
+from sqlalchemy.orm import selectinload
 # Gemini 2.5 Pro - June 6, 2025: Updated imports for new structure
 from ..models import UserProgress, StoryGeneration, StoryNode, Mission
 from ..models.character_data import Character
 from ..db import db # Placeholder, will be refined with db module implementation
+from .db_utils import no_expire_on_commit
 from ..services.story_maker import generate_story, get_openai_client
 from ..services.mission_generator import (
     generate_mission,
@@ -50,8 +56,9 @@ from ..services.mission_generator import (
 from ..services.state_manager import GameState, state_manager
 from ..utils.context_manager import OpenAIContextManager, configure_logging
 from ..utils.character_manager import format_character_info
-import json
+import os
 import sys
+import orjson
 
 # Configure proper logging for game engine
 def setup_game_engine_logging():
@@ -66,9 +73,9 @@ def setup_game_engine_logging():
         root_logger.addHandler(console_handler)
         root_logger.setLevel(logging.INFO)
     
-    # Configure httpx and openai for API debugging
-    logging.getLogger("httpx").setLevel(logging.DEBUG)
-    logging.getLogger("openai").setLevel(logging.DEBUG)
+    # httpx and openai log full request bodies at DEBUG, so keep them quiet
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("openai").setLevel(logging.WARNING)
     
     logger = logging.getLogger(__name__)
     logger.info("Game engine logging configured")
@@ -79,6 +86,163 @@ configure_logging()  # Configure OpenAI context manager logging
 
 logger = logging.getLogger(__name__)
 
+# Full payload dumps from make_choice (characters, prompt, continuation, node
+# metadata, final response) are opt-in on top of DEBUG logging
+LOG_MAKE_CHOICE_PAYLOADS = os.environ.get("SPYENGINE_LOG_PAYLOADS") == "1"
+
+def serialize_character(char: Character) -> Dict[str, Any]:
+    """Character fields stored in node metadata and passed to story continuation."""
+    return {
+        "id": char.id,
+        "name": char.character_name,
+        "character_name": char.character_name,
+        "character_role": char.character_role,
+        "character_traits": char.character_traits,
+        "plot_lines": char.plot_lines,
+        "backstory": char.backstory,
+        "description": char.description
+    }
+
+def encountered_character(details: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact character record stored in a node's encountered_characters list."""
+    return {
+        "id": details["id"],
+        "name": details["name"],
+        "backstory": details["backstory"] or "",
+        "plot_lines": details["plot_lines"] or []
+    }
+
+def dumps_debug(obj: Any) -> str:
+    """Serialize a payload for debug logging; values orjson can't encode are stringified."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+# Placeholder for story parameters missing from the start form
+STORY_PARAM_DEFAULT = 'GAME ENGINE ERROR DUMMY!!!'
+
+@dataclass
+class StoryParams:
+    """Story generation parameters, parsed once from the start form."""
+    __slots__ = (
+        'conflict',
+        'setting',
+        'narrative_style',
+        'mood',
+        'protagonist_name',
+        'protagonist_gender',
+        'character_info',
+        'additional_characters'
+    )
+    conflict: str
+    setting: str
+    narrative_style: str
+    mood: str
+    protagonist_name: Optional[str]
+    protagonist_gender: Optional[str]
+    character_info: Optional[Dict[str, Any]]
+    additional_characters: Optional[List[Dict[str, Any]]]
+
+    @classmethod
+    def from_form(cls, form_data: Dict[str, Any]) -> "StoryParams":
+        get = form_data.get
+        return cls(
+            get('conflict', STORY_PARAM_DEFAULT),
+            get('setting', STORY_PARAM_DEFAULT),
+            get('narrative_style', STORY_PARAM_DEFAULT),
+            get('mood', STORY_PARAM_DEFAULT),
+            get('protagonist_name'),
+            get('protagonist_gender'),
+            None,
+            None
+        )
+
+    def to_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for generate_story."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+@lru_cache(maxsize=1)
+def get_character_service() -> "CharacterInteractionService":
+    """Return the shared character interaction service; it holds no per-user state."""
+    return CharacterInteractionService()
+
+# Mission fields carried in each node's branch_metadata
+MISSION_INFO_FIELDS = (
+    'id',
+    'title',
+    'objective',
+    'status',
+    'progress',
+    'difficulty',
+    'reward_currency',
+    'reward_amount'
+)
+get_mission_info_fields = attrgetter(*MISSION_INFO_FIELDS)
+
+def mission_info(mission: Mission) -> Dict[str, Any]:
+    """Mission snapshot stored in node metadata."""
+    return dict(zip(MISSION_INFO_FIELDS, get_mission_info_fields(mission)))
+
+def story_parameters(story: StoryGeneration) -> Dict[str, Any]:
+    """Story parameters stored in node metadata for context continuity."""
+    return {
+        "conflict": story.primary_conflict,
+        "setting": story.setting,
+        "narrative_style": story.narrative_style,
+        "mood": story.mood
+    }
+
+@lru_cache(maxsize=128)
+def story_context_prefix(conflict: str, setting: str) -> str:
+    """Conflict/setting header prepended to the story context; fixed for a story's lifetime."""
+    return f"CONFLICT: {conflict}\nSETTING: {setting}"
+
+def compute_new_progress(current_progress: int, status: str) -> int:
+    """Mission progress after a continuation reports it progressed, completed or failed."""
+    if status == "progressed":
+        return min(100, current_progress + 25)  # 25% progress per story segment
+    if status == "completed":
+        return 100
+    return current_progress  # failed
+
+def build_branch_metadata(
+    story: StoryGeneration,
+    current_node: StoryNode,
+    choice_id: str,
+    custom_choice_text: Optional[str],
+    next_segment: Dict[str, Any],
+    active_mission: Mission,
+    node_count: int,
+    now_iso: str
+) -> Dict[str, Any]:
+    """Branch metadata for the node created by a player's choice."""
+    return {
+        # Story context
+        "story_id": story.id,
+        "choice_id": choice_id,
+        "branch_id": choice_id,
+        "timestamp": now_iso,
+        
+        # Choice context
+        "choice_text": custom_choice_text or choice_id,
+        "choices": next_segment["choices"],
+        
+        # Character IDs only; details live on the story's root node
+        "characters": [char.id for char in story.characters] if story.characters else [],
+        
+        # Mission information
+        "mission_info": mission_info(active_mission),
+        "mission_update": next_segment.get("mission_update", {}),
+        
+        # Protagonist information - carry over from current node
+        "protagonist": current_node.branch_metadata.get("protagonist", {}),
+        
+        # Story parameters - ensure continuity
+        "story_parameters": dict(story_parameters(story), node_count=node_count),
+        
+        # Previous node reference for context
+        "previous_node_id": current_node.id,
+        "previous_choice": choice_id
+    }
+
 class GameEngine:
     """
     Core game engine that drives the spy story game.
@@ -99,8 +263,103 @@ class GameEngine:
             user_id (str): Unique identifier for the user
         """
         self.user_id = user_id
+        self.character_service = get_character_service()
+        # Serialized character details by character ID, reused across turns
+        self._char_details_cache: Dict[int, Dict[str, Any]] = {}
+        # Encountered-character records by character ID, built once from the details
+        self._encountered_cache: Dict[int, Dict[str, Any]] = {}
+        # Continuation character info per story, keyed by story ID and tagged
+        # with the character IDs it was built from
+        self._char_info_cache: Dict[int, Tuple[Tuple[int, ...], List[Dict[str, Any]]]] = {}
+        # Engine-scoped lookups reused across calls; cleared on rollback
+        self._story_cache: Dict[int, StoryGeneration] = {}
+        self._active_mission: Optional[Mission] = None
+        # Prefetch before GameState so its primary-key lookups hit the identity map
+        self._prefetch()
         self.state = GameState(user_id)
-        self.character_service = CharacterInteractionService()
+
+    def _prefetch(self):
+        """
+        Load the user's progress, current story, current node and active mission
+        in one joined query.
+        
+        The rows land in the session identity map, so GameState's lookups by
+        primary key are served without further round-trips, and the story and
+        active mission seed the engine's caches.
+        """
+        row = db.session.query(UserProgress, StoryGeneration, StoryNode, Mission)\
+            .outerjoin(StoryGeneration, StoryGeneration.id == UserProgress.current_story_id)\
+            .outerjoin(StoryNode, StoryNode.id == UserProgress.current_node_id)\
+            .outerjoin(Mission, and_(Mission.user_id == UserProgress.user_id, Mission.status == "active"))\
+            .options(selectinload(StoryGeneration.characters))\
+            .filter(UserProgress.user_id == self.user_id)\
+            .first()
+        if row is None:
+            return
+        
+        _, story, _, mission = row
+        if story is not None:
+            self._story_cache[story.id] = story
+        self._active_mission = mission
+
+    def _get_story(self, story_id: int) -> Optional[StoryGeneration]:
+        """Return a story with its characters loaded, querying it at most once per engine."""
+        story = self._story_cache.get(story_id)
+        if story is None:
+            story = StoryGeneration.query.options(
+                selectinload(StoryGeneration.characters)
+            ).filter_by(id=story_id).first()
+            if story is not None:
+                self._story_cache[story_id] = story
+        return story
+
+    def _get_active_mission(self) -> Optional[Mission]:
+        """Return the user's active mission, querying it at most once per engine."""
+        if self._active_mission is None:
+            self._active_mission = Mission.query.filter_by(
+                user_id=self.user_id,
+                status="active"
+            ).first()
+        return self._active_mission
+
+    def _get_char_info(self, story: StoryGeneration) -> List[Dict[str, Any]]:
+        """Return character info for continuation, rebuilt only when the story's cast changes."""
+        character_ids = tuple(char.id for char in story.characters)
+        cached = self._char_info_cache.get(story.id)
+        if cached and cached[0] == character_ids:
+            return cached[1]
+        # Include both role formats for compatibility
+        char_info = [
+            dict(details, role=details["character_role"])
+            for details in self._get_character_details(story.characters)
+        ]
+        self._char_info_cache[story.id] = (character_ids, char_info)
+        return char_info
+
+    def _clear_cache(self):
+        """Drop cached story and mission lookups, e.g. after a rollback."""
+        self._story_cache.clear()
+        self._active_mission = None
+
+    def _get_character_details(self, characters: List[Character]) -> List[Dict[str, Any]]:
+        """Return serialized details for loaded characters, serializing each only once."""
+        details = []
+        for char in characters:
+            char_details = self._char_details_cache.get(char.id)
+            if char_details is None:
+                char_details = self._char_details_cache[char.id] = serialize_character(char)
+            details.append(char_details)
+        return details
+
+    def _get_encountered_characters(self, characters: List[Character]) -> List[Dict[str, Any]]:
+        """Return encountered-character records for loaded characters, building each only once."""
+        records = []
+        for char, details in zip(characters, self._get_character_details(characters)):
+            record = self._encountered_cache.get(char.id)
+            if record is None:
+                record = self._encountered_cache[char.id] = encountered_character(details)
+            records.append(record)
+        return records
 
     def start_new_story(self, form_data=None) -> Dict[str, Any]:
         """
@@ -120,21 +379,22 @@ class GameEngine:
                 - available_missions: List of available missions
         """
         try:
+            # One timestamp for every row and metadata entry this story creates
+            now = datetime.utcnow()
+            now_iso = now.isoformat()
+            
             # If form_data is a string, parse it to a dict
             if (form_data and isinstance(form_data, str)):
-                form_data = json.loads(form_data)
+                form_data = orjson.loads(form_data)
             # Get story parameters from form data with defaults:
-            story_params = {
-                'conflict': form_data.get('conflict', 'GAME ENGINE ERROR DUMMY!!!'),
-                'setting': form_data.get('setting', 'GAME ENGINE ERROR DUMMY!!!'),
-                'narrative_style': form_data.get('narrative_style', 'GAME ENGINE ERROR DUMMY!!!'),
-                'mood': form_data.get('mood', 'GAME ENGINE ERROR DUMMY!!!'),
-                'protagonist_name': form_data.get('protagonist_name'),
-                'protagonist_gender': form_data.get('protagonist_gender')
+            story_params = StoryParams.from_form(form_data)
+            protagonist = {
+                "name": story_params.protagonist_name,
+                "gender": story_params.protagonist_gender
             }
             
             # --- BEGIN ADDED CHECK ---
-            request_protagonist_name = story_params.get('protagonist_name')
+            request_protagonist_name = protagonist["name"]
             if self.state.user_progress and self.state.user_progress.current_node_id and request_protagonist_name:
                 try:
                     existing_node = StoryNode.query.get(self.state.user_progress.current_node_id)
@@ -153,7 +413,7 @@ class GameEngine:
                             self.state.user_progress.failed_missions = []
                             self.state.user_progress.choice_history = []
                             self.state.user_progress.encountered_characters = {}
-                            self.state.user_progress.last_active = datetime.utcnow()
+                            self.state.user_progress.last_active = now
                             
                             # Commit the reset
                             db.session.add(self.state.user_progress)
@@ -181,24 +441,24 @@ class GameEngine:
                 if selected_characters:
                     main_character = selected_characters[0]
                     # Replace format_character_info with an inline dict to ensure proper type
-                    story_params['character_info'] = {
+                    story_params.character_info = {
                         "id": main_character.id,
                         "character_name": main_character.character_name,
                         "character_traits": main_character.character_traits or {},
-                        "backstory": getattr(main_character, 'backstory', ""),
-                        "plot_lines": getattr(main_character, 'plot_lines', []),
+                        "backstory": main_character.backstory,
+                        "plot_lines": main_character.plot_lines,
                         "character_role": main_character.character_role
                     }
                     
                     # Add any additional characters to additional_characters
                     if len(selected_characters) > 1:
-                        story_params['additional_characters'] = [
+                        story_params.additional_characters = [
                             {
                                 "id": char.id,
                                 "name": char.character_name,
                                 "character_traits": char.character_traits,
-                                "backstory": getattr(char, 'backstory', ""),
-                                "plot_lines": getattr(char, 'plot_lines', []),
+                                "backstory": char.backstory,
+                                "plot_lines": char.plot_lines,
                                 "role": char.character_role,
                                 "role_requirements": ""
                             }
@@ -206,20 +466,11 @@ class GameEngine:
                         ]
             
             try:
-                # Get OpenAI client
-                client = get_openai_client()
-                if client is None:
-                    raise ValueError("Failed to initialize OpenAI client")
-                
-                # Add client to story parameters
-                story_params['client'] = client
-                
-                # Generate new story using story_maker
-                story_data = generate_story(**story_params)
-                
-                # Start database transaction
-                db.session.begin_nested()
+                # Generate new story using story_maker with the shared OpenAI client;
+                # get_openai_client raises rather than returning None
+                story_data = generate_story(client=get_openai_client(), **story_params.to_kwargs())
                 
+                # Writes below run in the session's transaction and are rolled back on error
                 # Create story in database
                 story = StoryGeneration(
                     user_id=self.user_id,
@@ -245,49 +496,22 @@ class GameEngine:
                     branch_metadata={
                         # Story context
                         "story_id": story.id,
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": now_iso,
                         
-                        # Character information
+                        # Character information; details are snapshotted once on the root node
                         "characters": [char.id for char in selected_characters] if selected_character_ids else [],
-                        "character_details": [
-                            {
-                                "id": char.id,
-                                "name": char.character_name,
-                                "character_name": char.character_name,
-                                "character_role": char.character_role,
-                                "character_traits": getattr(char, "character_traits", {}),
-                                "plot_lines": getattr(char, "plot_lines", []),
-                                "backstory": getattr(char, "backstory", ""),
-                                "description": getattr(char, "description", "")
-                            } for char in selected_characters
-                        ] if selected_character_ids else [],
+                        "character_details": self._get_character_details(selected_characters) if selected_character_ids else [],
                         
                         # Player choices
                         "choices": story_data["choices"],
                         
                         # Protagonist information 
-                        "protagonist": {
-                            "name": form_data.get('protagonist_name'),
-                            "gender": form_data.get('protagonist_gender')
-                        },
+                        "protagonist": protagonist,
                         
                         # Story parameters for context continuity
-                        "story_parameters": {
-                            "conflict": story.primary_conflict,
-                            "setting": story.setting,
-                            "narrative_style": story.narrative_style,
-                            "mood": story.mood
-                        }
+                        "story_parameters": story_parameters(story)
                     }
                 )
-                db.session.add(initial_node)
-                db.session.flush()  # Flush to get initial_node.id
-                
-                # Update user progress
-                self.state.user_progress.current_story_id = story.id
-                self.state.user_progress.current_node_id = initial_node.id
-                self.state.user_progress.last_active = datetime.utcnow()
-                
                 # Create initial mission with proper parameters
                 mission = Mission(
                     user_id=self.user_id,
@@ -300,25 +524,36 @@ class GameEngine:
                     difficulty='medium',  # Default difficulty for initial mission
                     reward_currency='💵',  # Default currency
                     reward_amount=1500,  # Default reward
-                    deadline=datetime.utcnow() + timedelta(days=7),  # 7-day deadline
+                    deadline=now + timedelta(days=7),  # 7-day deadline
                     story_id=story.id,
                     progress=0,
                     progress_updates=[{
                         "progress": 0,
                         "status": "active",
-                        "timestamp": datetime.utcnow().isoformat(),
+                        "timestamp": now_iso,
                         "description": "Mission assigned"
                     }]
                 )
-                db.session.add(mission)
                 
-                # Update state
+                # Insert the node and mission in one flush to get initial_node.id
+                db.session.add_all([initial_node, mission])
+                db.session.flush()
+                
+                # Update user progress
+                self.state.user_progress.current_story_id = story.id
+                self.state.user_progress.current_node_id = initial_node.id
+                self.state.user_progress.last_active = now
+                
+                # Update state and cached lookups
+                self._story_cache[story.id] = story
+                self._active_mission = mission
                 self.state.current_story = story
                 self.state.current_node = initial_node
                 self.state.active_missions = [mission]
                 
-                # Commit all changes
-                db.session.commit()
+                # Commit all changes; instances stay loaded for the response below
+                with no_expire_on_commit(db.session):
+                    db.session.commit()
                 
                 # Notify state manager
                 state_manager.update_state(self.state.to_dict())
@@ -336,10 +571,7 @@ class GameEngine:
                         "branch_metadata": {
                             "choices": story_data["choices"],
                             "characters": [char.id for char in selected_characters] if selected_character_ids else [],
-                            "protagonist": {
-                                "name": form_data.get('protagonist_name'),
-                                "gender": form_data.get('protagonist_gender')
-                            }
+                            "protagonist": protagonist
                         }
                     },
                     "available_missions": [
@@ -359,12 +591,14 @@ class GameEngine:
             except Exception as e:
                 # Rollback transaction on any error
                 db.session.rollback()
+                self._clear_cache()
                 raise RuntimeError(f"Story generation failed: {str(e)}")
                 
         except Exception as e:
             logger.error(f"Error starting new story: {str(e)}", exc_info=True)
             # Ensure any open transaction is rolled back
             db.session.rollback()
+            self._clear_cache()
             raise RuntimeError(f"Failed to start new story: {str(e)}")
 
     def get_active_missions(self, user_id: str) -> List[Mission]:
@@ -407,13 +641,18 @@ class GameEngine:
         """
         try:
             logger.info("=== make_choice method called ===")
-            logger.debug(f"Choice ID: {choice_id}")
-            logger.debug(f"Custom choice text: {custom_choice_text}")
-            logger.debug(f"Story context: {story_context}")
-            logger.debug(f"Characters: {json.dumps(characters, default=str, indent=2) if characters else 'None'}")
+            now_iso = datetime.utcnow().isoformat()
+            # Serializing debug payloads is skipped entirely unless DEBUG is enabled,
+            # and full payloads additionally need SPYENGINE_LOG_PAYLOADS=1
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            log_payloads = debug_enabled and LOG_MAKE_CHOICE_PAYLOADS
+            if debug_enabled:
+                logger.debug("Choice ID: %s", choice_id)
+                logger.debug("Custom choice text: %s", custom_choice_text)
+                logger.debug("Story context: %s", story_context)
+            if log_payloads:
+                logger.debug("Characters: %s", dumps_debug(characters) if characters else 'None')
             
-            # Start transaction
-            db.session.begin_nested()
             # Reload the game state from the database to ensure latest parameters
             logger.info("Reloading game state from database")
             self.state.reload_state()
@@ -426,7 +665,8 @@ class GameEngine:
             if not self.state.user_progress.current_story_id:
                 raise ValueError("No active story ID found in user progress")
                 
-            story = StoryGeneration.query.get(self.state.user_progress.current_story_id)
+            # Loaded with its characters so they are not lazy-loaded mid-turn
+            story = self._get_story(self.state.user_progress.current_story_id)
             if not story:
                 raise ValueError("No active story found")
             
@@ -440,18 +680,16 @@ class GameEngine:
             logger.info("Getting node context")
             node_context = self.state.get_node_context(current_node.id)
             
-            debug_info = {
-                'active_missions_count': len(node_context.get('active_missions', [])), 
-                'has_relationships': bool(node_context.get('character_relationships')),
-                'has_story_context': bool(node_context.get('story_context'))
-            }
-            logger.debug(f"Node context: {json.dumps(debug_info, indent=2)}")
+            if debug_enabled:
+                debug_info = {
+                    'active_missions_count': len(node_context.get('active_missions', [])), 
+                    'has_relationships': bool(node_context.get('character_relationships')),
+                    'has_story_context': bool(node_context.get('story_context'))
+                }
+                logger.debug("Node context: %s", dumps_debug(debug_info))
             
             # Get the active mission from the database
-            active_mission = Mission.query.filter_by(
-                user_id=self.user_id,
-                status="active"  # Changed from "in_progress" to "active" to match model
-            ).first()
+            active_mission = self._get_active_mission()
             
             if not active_mission:
                 logger.warning("No active mission found for user")
@@ -468,42 +706,31 @@ class GameEngine:
                 )
                 db.session.add(active_mission)
                 db.session.flush()
+                self._active_mission = active_mission
             
             # Augment story_context with conflict and setting from the current story
-            conflict = story.primary_conflict if hasattr(story, 'primary_conflict') else "Unknown conflict"
-            setting = story.setting if hasattr(story, 'setting') else "Unknown setting"
-            if story_context:
-                story_context = f"CONFLICT: {conflict}\nSETTING: {setting}\n{story_context}"
-            else:
-                story_context = f"CONFLICT: {conflict}\nSETTING: {setting}"
+            conflict = story.primary_conflict
+            setting = story.setting
+            context_prefix = story_context_prefix(conflict, setting)
+            story_context = f"{context_prefix}\n{story_context}" if story_context else context_prefix
             
             # Extract protagonist details from the branch metadata of the current node
             protagonist = current_node.branch_metadata.get("protagonist", {})
             
             # Increment node count in the game state
             logger.info("Incrementing node count in GameState")
-            node_count = self.state.increment_node_count()
-            logger.info(f"Node count is now: {node_count}")
+            # Written with the turn's single commit at the end of make_choice
+            node_count = self.state.increment_node_count(commit=False)
+            logger.info("Node count is now: %d", node_count)
             
             # Format characters for the context manager
-            char_info = []
-            if story.characters:
-                char_info = [{
-                    "id": char.id,
-                    "name": char.character_name,
-                    "character_name": char.character_name,
-                    "character_role": char.character_role,
-                    "character_traits": getattr(char, "character_traits", {}),
-                    "plot_lines": getattr(char, "plot_lines", []),
-                    "backstory": getattr(char, "backstory", ""),
-                    "description": getattr(char, "description", ""),
-                    "role": char.character_role  # Include both formats for compatibility
-                } for char in story.characters]
-            
-            logger.debug(f"Formatted {len(char_info)} characters for context manager")
-            
-            # Build user message for continuation
-            user_message = f"""
+            char_info = self._get_char_info(story)
+            
+            logger.debug("Formatted %d characters for context manager", len(char_info))
+            
+            # The continuation prompt is assembled by segment_maker; this copy is only logged
+            if log_payloads:
+                user_message = f"""
 PLAYER'S CHOICE:
 {custom_choice_text or choice_id}
 
@@ -516,19 +743,19 @@ Progress: {active_mission.progress}%
 STORY CONTEXT:
 {story_context or ""}
 """
-            logger.debug(f"User message for continuation: {user_message}")
+                logger.debug("User message for continuation: %s", user_message)
             
             # Get enhanced context from state manager
             logger.info("Getting enhanced context from state manager")
             enhanced_context = node_context.get("enhanced_context", "")
-            logger.debug(f"Enhanced context length: {len(enhanced_context)}")
+            logger.debug("Enhanced context length: %d", len(enhanced_context))
             
             # Generate next story segment using segment_maker with stateless approach
             logger.info("Calling generate_continuation...")
-            logger.info(f"Parameters being passed: conflict={conflict}, setting={setting}, mood={story.mood}, narrative_style={story.narrative_style}, node_count={node_count}")
-            
-            # --- Add Type Logging --- 
-            logger.info(f"Type of 'active_mission' BEFORE calling generate_continuation: {type(active_mission)}")
+            logger.info(
+                "Parameters being passed: conflict=%s, setting=%s, mood=%s, narrative_style=%s, node_count=%d",
+                conflict, setting, story.mood, story.narrative_style, node_count
+            )
             next_segment = generate_continuation(
                 previous_story=current_node.narrative_text,
                 chosen_choice=custom_choice_text or choice_id,
@@ -545,153 +772,130 @@ STORY CONTEXT:
             )
             
             # Log the continuation data
-            logger.debug(f"Generated continuation data: {json.dumps(next_segment, indent=2)}")
+            if log_payloads:
+                logger.debug("Generated continuation data: %s", dumps_debug(next_segment))
             
             # Process mission updates from the continuation
             mission_updates = []
             if "mission_update" in next_segment:
                 mission_update = next_segment["mission_update"]
                 if mission_update.get("status") in ["progressed", "completed", "failed"]:
-                    # Calculate new progress
-                    current_progress = active_mission.progress
-                    if mission_update["status"] == "progressed":
-                        new_progress = min(100, current_progress + 25)  # 25% progress per story segment
-                    elif mission_update["status"] == "completed":
-                        new_progress = 100
-                    else:  # failed
-                        new_progress = current_progress
-                        
+                    new_progress = compute_new_progress(active_mission.progress, mission_update["status"])
+                    
                     # Update mission in database
-                    mission_updates.append(self.update_mission(active_mission.id, new_progress / 100.0))
-                    logger.info(f"Updated mission {active_mission.id} to progress {new_progress}%")
+                    mission_updates.append(self._update_mission_percent(active_mission.id, new_progress, notify=False))
+                    logger.info("Updated mission %s to progress %s%%", active_mission.id, new_progress)
             
+            # Maintain character relationships from the story
+            story_characters = []
+            if characters:
+                # Convert character IDs to integers; reuse the story's loaded characters
+                # and fetch only the rest in a single batched query
+                character_ids = [int(char["id"]) for char in characters]
+                loaded = {char.id: char for char in story.characters}
+                missing_ids = [char_id for char_id in character_ids if char_id not in loaded]
+                if missing_ids:
+                    for char in Character.query.filter(Character.id.in_(missing_ids)).all():
+                        loaded[char.id] = char
+                story_characters = [loaded[char_id] for char_id in dict.fromkeys(character_ids) if char_id in loaded]
+
+            # Build the complete branch metadata before creating the node, so the
+            # JSONB column is serialized exactly once on insert rather than being
+            # mutated in place after assignment
+            branch_metadata = build_branch_metadata(
+                story,
+                current_node,
+                choice_id,
+                custom_choice_text,
+                next_segment,
+                active_mission,
+                node_count,
+                now_iso
+            )
+            if characters:
+                # NEW: Save encountered character IDs and details in branch metadata; the
+                # records are shared per character rather than rebuilt every turn
+                encountered_ids = [char.id for char in story_characters]
+                encountered_characters = self._get_encountered_characters(story_characters)
+                branch_metadata["characters"] = encountered_ids
+                branch_metadata["encountered_characters"] = encountered_characters
+
             # Create new node using updated continuation data from branch_metadata
             next_node = StoryNode(
                 story_id=story.id,
                 narrative_text=next_segment["narrative_text"],  # Use the clean narrative text
                 parent_node_id=current_node.id,
                 generated_by_ai=True,
-                branch_metadata={
-                    # Story context
-                    "story_id": story.id,
-                    "choice_id": choice_id,
-                    "branch_id": choice_id,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    
-                    # Choice context
-                    "choice_text": custom_choice_text or choice_id,
-                    "choices": next_segment["choices"],
-                    
-                    # Character information
-                    "characters": [char.id for char in story.characters] if story.characters else [],
-                    "character_details": [
-                        {
-                            "id": char.id,
-                            "name": char.character_name,
-                            "character_name": char.character_name,
-                            "character_role": char.character_role,
-                            "character_traits": getattr(char, "character_traits", {}),
-                            "plot_lines": getattr(char, "plot_lines", []),
-                            "backstory": getattr(char, "backstory", ""),
-                            "description": getattr(char, "description", "")
-                        } for char in story.characters
-                    ] if story.characters else [],
-                    
-                    # Mission information
-                    "mission_info": {
-                        "id": active_mission.id,
-                        "title": active_mission.title,
-                        "objective": active_mission.objective,
-                        "status": active_mission.status,
-                        "progress": active_mission.progress,
-                        "difficulty": active_mission.difficulty,
-                        "reward_currency": active_mission.reward_currency,
-                        "reward_amount": active_mission.reward_amount
-                    },
-                    "mission_update": next_segment.get("mission_update", {}),
-                    
-                    # Protagonist information - carry over from current node
-                    "protagonist": current_node.branch_metadata.get("protagonist", {}),
-                    
-                    # Story parameters - ensure continuity
-                    "story_parameters": {
-                        "conflict": story.primary_conflict,
-                        "setting": story.setting,
-                        "narrative_style": story.narrative_style,
-                        "mood": story.mood,
-                        "node_count": node_count  # Store current node count
-                    },
-                    
-                    # Previous node reference for context
-                    "previous_node_id": current_node.id,
-                    "previous_choice": choice_id
-                }
+                character_id=story_characters[0].id if story_characters else None,
+                branch_metadata=branch_metadata
             )
-            
-            # Maintain character relationships from the story
-            if characters:
-                # Convert character IDs to integers and query the characters
-                character_ids = [int(char["id"]) for char in characters]
-                story_characters = Character.query.filter(Character.id.in_(character_ids)).all()
-                next_node.branch_metadata["characters"] = [char.id for char in story_characters]
-                # NEW: Save encountered character details in branch metadata
-                next_node.branch_metadata["encountered_characters"] = [
-                    {
-                        "id": char.id,
-                        "name": char.character_name,
-                        "backstory": getattr(char, "backstory", ""),
-                        "plot_lines": getattr(char, "plot_lines", [])
-                    } for char in story_characters
-                ]
-                if story_characters:
-                    next_node.character_id = story_characters[0].id
                     
             # Add node to session and flush to get ID
             db.session.add(next_node)
             db.session.flush()
             
             # Log the node data before transition
-            logger.debug(f"Node data before transition: {json.dumps(next_node.branch_metadata, indent=2)}")
+            if log_payloads:
+                logger.debug("Node data before transition: %s", dumps_debug(next_node.branch_metadata))
             
             try:
                 # Transition to new node
                 if not self.state.transition_to_node(next_node.id):
                     raise RuntimeError("Failed to transition to new node")
             except Exception as e:
-                logger.error(f"Error during node transition: {str(e)}")
+                logger.error("Error during node transition: %s", e)
                 raise RuntimeError(f"Failed to transition to new node: {str(e)}")
             
-            # Update missions based on choice
+            # Update missions based on choice with one server-side UPDATE inside the
+            # same transaction as the new node; RETURNING reports the new progress
+            # where the database supports it, otherwise the rows are re-read
             mission_updates = []
-            for mission in self.state.active_missions:
-                if update_mission_progress(mission.id, int(mission.progress + 10)):
-                    mission_updates.append(mission)
+            active_mission_ids = [mission.id for mission in self.state.active_missions]
+            if active_mission_ids:
+                bumped = Mission.progress + 10
+                bump = update(Mission).where(Mission.id.in_(active_mission_ids)).values(
+                    progress=case((bumped > 100, 100), else_=bumped)
+                )
+                if db.session.get_bind().dialect.update_returning:
+                    updated = db.session.execute(bump.returning(Mission.id, Mission.progress)).all()
+                else:
+                    db.session.execute(bump)
+                    updated = db.session.query(Mission.id, Mission.progress)\
+                        .filter(Mission.id.in_(active_mission_ids))\
+                        .all()
+                mission_updates = [{"id": row.id, "progress": row.progress} for row in updated]
             
             # Update character relationships
             character_updates = []
             if characters:
                 # Ensure characters are associated with the story
                 if story_characters:
-                    # Properly maintain the many-to-many relationship
-                    for char in story_characters:
-                        if char not in story.characters:
-                            story.characters.append(char)
+                    # Properly maintain the many-to-many relationship; story.characters is
+                    # already loaded, so new links are found by a set difference on IDs
+                    linked_ids = {char.id for char in story.characters}
+                    story.characters.extend(char for char in story_characters if char.id not in linked_ids)
                     
-                # Update relationship tracking
+                # Update relationship tracking; the changes join this turn's commit
                 updates = self.character_service.update_relationships(
                     self.user_id,
                     story.id,
                     current_node.id,
-                    next_node.id
+                    next_node.id,
+                    commit=False
                 )
                 if updates:
                     character_updates.extend(updates)
             
-            # Commit all changes
-            db.session.commit()
-            
-            # Log the final node state after commit
-            logger.debug(f"Final node state after commit: {json.dumps(next_node.to_dict(), indent=2)}")
+            # Commit all changes; instances stay loaded so the state and response
+            # built below don't re-SELECT every row
+            with no_expire_on_commit(db.session):
+                # The bulk UPDATE bypasses Mission.update_progress, so missions it
+                # brought to 100 are completed here (status, log entry, reward and
+                # the move to completed_missions); complete_mission commits the turn
+                for mission_update in mission_updates:
+                    if mission_update["progress"] >= 100 and self._complete_mission(mission_update["id"]):
+                        mission_update["status"] = "completed"
+                db.session.commit()
             
             # Update state manager
             state_manager.update_state(self.state.to_dict())
@@ -706,40 +910,52 @@ STORY CONTEXT:
                 "mission_updates": mission_updates,
                 "character_updates": character_updates
             }
-            logger.debug("Final response from make_choice: %s", json.dumps(final_response, indent=2))
+            if log_payloads:
+                logger.debug("Final response from make_choice: %s", dumps_debug(final_response))
             
             # Return updated game state
             return final_response
             
         except Exception as e:
-            logger.error(f"Error in make_choice: {str(e)}", exc_info=True)
+            logger.error("Error in make_choice: %s", e, exc_info=True)
             db.session.rollback()
+            self._clear_cache()
             raise RuntimeError(f"Failed to process choice: {str(e)}")
 
-    def update_mission(self, mission_id: str, progress: float) -> Dict[str, Any]:
+    def update_mission(self, mission_id: str, progress: float, notify: bool = True) -> Dict[str, Any]:
         """
         Update mission progress and handle completion.
         
         Args:
             mission_id (str): ID of the mission to update
             progress (float): New progress value (0-1)
+            notify (bool): Publish the game state to the state manager; callers
+                that publish once themselves afterwards pass False
             
         Returns:
             Dict[str, Any]: Updated mission state
         """
-        mission = Mission.query.get(mission_id)
-        if not mission or mission.user_id != self.user_id:
+        return self._update_mission_percent(mission_id, int(progress * 100), notify)
+
+    def _update_mission_percent(self, mission_id: str, progress: int, notify: bool) -> Dict[str, Any]:
+        """update_mission with progress already in the stored 0-100 percentage form."""
+        # The engine's active mission is already loaded and known to be the user's;
+        # anything else is fetched with the ownership check done in SQL
+        mission = self._active_mission
+        if mission is None or mission.id != mission_id:
+            mission = Mission.query.filter_by(id=mission_id, user_id=self.user_id).first()
+        if not mission:
             return None
             
-        # Update progress
-        if update_mission_progress(mission.id, int(progress * 100)):
+        # Update progress; when nothing changed there is no new state to publish
+        if update_mission_progress(mission.id, progress):
             # Check completion
             if mission.progress >= 100:
-                if complete_mission(mission.id, self.user_id):
-                    self.state.user_progress.completed_missions.append(mission_id)
-        
-        # Update state manager
-        state_manager.update_state(self.state.to_dict())
+                self._complete_mission(mission.id)
+            
+            # Update state manager
+            if notify:
+                state_manager.update_state(self.state.to_dict())
         
         return {
             "id": mission.id,
@@ -749,6 +965,22 @@ STORY CONTEXT:
             "rewards": mission.reward_currency if mission.status == "completed" else None
         }
 
+    def _complete_mission(self, mission_id: int) -> bool:
+        """
+        Complete an active mission and drop it from the engine's and state's active missions.
+        
+        complete_mission already moves the ID from the user's active_missions to
+        completed_missions, so the lists are not touched here.
+        """
+        if not complete_mission(mission_id, self.user_id):
+            return False
+        self.state.active_missions = [
+            mission for mission in self.state.active_missions if mission.id != mission_id
+        ]
+        if self._active_mission is not None and self._active_mission.id == mission_id:
+            self._active_mission = None
+        return True
+
     def interact_with_character(self, character_id: str, interaction_type: str) -> Dict[str, Any]:
         """
         Handle character interaction and update relationships.
@@ -78,11 +78,11 @@ class Character(db.Model):
     # Character attributes
     character_traits = db.Column(JSONB)  # List of personality traits
     character_role = db.Column(db.String(100))  # villain/neutral/mission-giver/undetermined
-    plot_lines = db.Column(JSONB)  # Associated plot lines and story arcs
+    plot_lines = db.Column(JSONB, default=list)  # Associated plot lines and story arcs
     
     # Descriptive fields
-    backstory = db.Column(db.Text)
-    description = db.Column(db.Text)
+    backstory = db.Column(db.Text, default="")
+    description = db.Column(db.Text, default="")
 
     # Timestamps
     created_at = db.Column(db.DateTime, default=db.func.now())
@@ -90,4 +90,7 @@ class Character(db.Model):
 
     def __repr__(self):
         """String representation of the character"""
-        return f'<Character {self.id}: {self.character_name}>'
\ No newline at end of file
+        return f'<Character {self.id}: {self.character_name}>'
+
+# Case-insensitive exact name lookups, e.g. resolving mission givers and targets
+db.Index('ix_characters_character_name_lower', db.func.lower(Character.character_name))
@@ -27,13 +27,29 @@ Dependencies:
 """
 
 import logging
-import re
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 import json
+import orjson
 
+from sqlalchemy import cast, func, or_
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import flag_modified
 from models import Mission, UserProgress, StoryGeneration, Character
 from database import db
+from .mission_patterns import (
+    DEADLINE_ANCHORS,
+    DEADLINE_RE,
+    FALLBACK_GIVER_RE,
+    FALLBACK_OBJECTIVE_RE,
+    FALLBACK_REWARD_RE,
+    FALLBACK_TARGET_RE,
+    OBJECTIVE_RE,
+    REWARD_RE,
+    VILLAIN_RE,
+    iter_speaker_dialogue
+)
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +69,30 @@ BASE_REWARDS = {
     '💴': 150000  # Yen - Asian operations
 }
 
+# (medium, hard) reward thresholds per currency: a reward above 1.5x the base is
+# medium and above 2.5x is hard. Rewards are whole numbers, so flooring the
+# thresholds doesn't change any comparison.
+DIFFICULTY_THRESHOLDS = {
+    currency: (int(base * 1.5), int(base * 2.5)) for currency, base in BASE_REWARDS.items()
+}
+
+# Starting values for extract_mission_details; copied per call
+MISSION_DETAIL_DEFAULTS = {
+    "giver": None,
+    "giver_id": None,
+    "target": None,
+    "target_id": None,
+    "objective": "Objective not clearly specified.",
+    "deadline": "As soon as possible",
+    "reward_amount": 1500,
+    "reward_currency": '',
+    "difficulty": "medium"
+}
+
+# Currency symbols a reward match must contain; a dialogue without any of them
+# skips REWARD_RE entirely
+REWARD_CURRENCIES = tuple(BASE_REWARDS)
+
 def extract_mission_details(story_text: str, characters: Optional[List[Dict]] = None) -> Optional[Dict[str, Any]]:
     """
     Extract mission details from generated story text by focusing on mission-giver character dialogue.
@@ -77,17 +117,7 @@ def extract_mission_details(story_text: str, characters: Optional[List[Dict]] =
     try:
         logger.info("Starting mission extraction from story text...")
         
-        mission_details = {
-            "giver": None,
-            "giver_id": None,
-            "target": None,
-            "target_id": None,
-            "objective": "Objective not clearly specified.",
-            "deadline": "As soon as possible",
-            "reward_amount": 1500,
-            "reward_currency": '',
-            "difficulty": "medium"
-        }
+        mission_details = dict(MISSION_DETAIL_DEFAULTS)
         
         # Identify potential mission-givers from character list
         mission_givers = []
@@ -97,265 +127,335 @@ def extract_mission_details(story_text: str, characters: Optional[List[Dict]] =
                 if char.get('character_role') == 'mission-giver' 
                 or 'giver' in str(char.get('character_role', '')).lower()
             ]
-            logger.info(f"Found {len(mission_givers)} potential mission givers in character list")
+            logger.info("Found %d potential mission givers in character list", len(mission_givers))
         
         # If we have identified mission givers, look for their dialogue
         if mission_givers:
+            # Validate all giver IDs against the characters table in one query; IDs
+            # are compared as strings since character dicts may carry either form
+            giver_ids = [giver['id'] for giver in mission_givers if giver.get('id')]
+            valid_giver_ids = set()
+            if giver_ids:
+                valid_giver_ids = {
+                    str(row.id) for row in db.session.query(Character.id).filter(Character.id.in_(giver_ids)).all()
+                }
+            # Map each giver name to its character (a later duplicate name wins)
+            givers_by_name = {}
             for giver in mission_givers:
                 giver_name = giver.get('character_name') or giver.get('name')
-                if not giver_name:
-                    continue
-                    
-                logger.info(f"Looking for dialogue from mission giver: {giver_name}")
+                if giver_name:
+                    givers_by_name[giver_name] = giver
+            logger.info("Looking for dialogue from mission givers: %s", list(givers_by_name))
+            
+            # Find dialogue sections from these characters (quotes after a character name),
+            # splitting the story into passages once for all givers
+            for giver_name, giver, dialogue in iter_speaker_dialogue(story_text, givers_by_name):
+                logger.debug("Found dialogue from %s: %.50s", giver_name, dialogue)
                 
-                # Find dialogue sections from this character (looking for quotes after character name)
-                dialogue_pattern = rf"{re.escape(giver_name)}[^\"]*(\"[^\"]*\")"
-                dialogue_matches = re.finditer(dialogue_pattern, story_text)
+                # Set the giver information
+                mission_details["giver"] = giver_name
+                # Validate giver_id exists in characters table before using
+                if str(giver.get('id')) in valid_giver_ids:
+                    mission_details["giver_id"] = giver.get('id')
+                else:
+                    mission_details["giver_id"] = None
+                    logger.warning("Invalid giver_id %s - not found in characters table", giver.get('id'))
                 
-                for match in dialogue_matches:
-                    dialogue = match.group(1).strip('"')
-                    logger.info(f"Found dialogue from {giver_name}: {dialogue[:50]}..." if len(dialogue) > 50 else dialogue)
-                    
-                    # Set the giver information
-                    mission_details["giver"] = giver_name
-                    # Validate giver_id exists in characters table before using
-                    if giver.get('id') and db.session.query(Character).filter_by(id=giver['id']).first():
-                        mission_details["giver_id"] = giver.get('id')
+                # Extract mission components from dialogue
+                # Look for villain/target mentions
+                villain_match = VILLAIN_RE.search(dialogue)
+                if villain_match:
+                    mission_details["target"] = villain_match.group(1)
+                    logger.debug("Extracted target: %s", mission_details['target'])
+                
+                # Extract objective - looking for what needs to be done
+                objective_match = OBJECTIVE_RE.search(dialogue)
+                if objective_match:
+                    mission_details["objective"] = objective_match.group(1).strip()
+                    logger.debug("Extracted objective: %s", mission_details['objective'])
+                
+                # Extract deadline
+                deadline_match = None
+                if any(anchor in dialogue for anchor in DEADLINE_ANCHORS):
+                    deadline_match = DEADLINE_RE.search(dialogue)
+                if deadline_match:
+                    time_value = deadline_match.group(1)
+                    time_unit = deadline_match.group(2)
+                    mission_details["deadline"] = f"Complete within {time_value} {time_unit}"
+                    logger.debug("Extracted deadline: %s", mission_details['deadline'])
+                
+                # Extract reward
+                reward_match = None
+                if any(currency in dialogue for currency in REWARD_CURRENCIES):
+                    reward_match = REWARD_RE.search(dialogue)
+                if reward_match:
+                    if reward_match.group("amount"):
+                        amount, currency = reward_match.group("amount", "currency")
                     else:
-                        mission_details["giver_id"] = None
-                        logger.warning(f"Invalid giver_id {giver.get('id')} - not found in characters table")
-                    
-                    # Extract mission components from dialogue
-                    # Look for villain/target mentions
-                    villain_patterns = [
-                        r"(?:defeat|stop|investigate|find|locate|capture|eliminate|monitor) ([A-Z][a-z]+ [A-Z][a-z]+|[A-Z][a-z]+)",
-                        r"(?:target|villain|enemy|opponent) (?:is|will be) ([A-Z][a-z]+ [A-Z][a-z]+|[A-Z][a-z]+)"
-                    ]
-                    
-                    for pattern in villain_patterns:
-                        villain_match = re.search(pattern, dialogue)
-                        if villain_match:
-                            mission_details["target"] = villain_match.group(1)
-                            logger.info(f"Extracted target: {mission_details['target']}")
-                            break
-                    
-                    # Extract objective - looking for what needs to be done
-                    objective_patterns = [
-                        r"need you to ([^\.]+)",
-                        r"your mission is to ([^\.]+)",
-                        r"objective is to ([^\.]+)",
-                        r"assignment is to ([^\.]+)",
-                        r"task is to ([^\.]+)"
-                    ]
-                    
-                    for pattern in objective_patterns:
-                        objective_match = re.search(pattern, dialogue)
-                        if objective_match:
-                            mission_details["objective"] = objective_match.group(1).strip()
-                            logger.info(f"Extracted objective: {mission_details['objective']}")
-                            break
-                    
-                    # Extract deadline
-                    deadline_patterns = [
-                        r"within (\d+) (days|hours|weeks)",
-                        r"deadline is (\d+) (days|hours|weeks)",
-                        r"must be completed in (\d+) (days|hours|weeks)",
-                        r"you have (\d+) (days|hours|weeks)"
-                    ]
-                    
-                    for pattern in deadline_patterns:
-                        deadline_match = re.search(pattern, dialogue)
-                        if deadline_match:
-                            time_value = deadline_match.group(1)
-                            time_unit = deadline_match.group(2)
-                            mission_details["deadline"] = f"Complete within {time_value} {time_unit}"
-                            logger.info(f"Extracted deadline: {mission_details['deadline']}")
-                            break
-                    
-                    # Extract reward
-                    reward_patterns = [
-                        r"reward of (\d{1,3}(?:,\d{3})*|\d+)\s*([💎💵💷💶💴])",
-                        r"(\d{1,3}(?:,\d{3})*|\d+)\s*([💎💵💷💶💴]) reward",
-                        r"pay you (\d{1,3}(?:,\d{3})*|\d+)\s*([💎💵💷💶💴])",
-                        r"payment of (\d{1,3}(?:,\d{3})*|\d+)\s*([💎💵💷💶💴])"
-                    ]
-                    
-                    for pattern in reward_patterns:
-                        reward_match = re.search(pattern, dialogue)
-                        if reward_match:
-                            try:
-                                mission_details["reward_amount"] = int(reward_match.group(1).replace(",", ""))
-                                mission_details["reward_currency"] = reward_match.group(2)
-                                logger.info(f"Extracted reward: {mission_details['reward_amount']} {mission_details['reward_currency']}")
-                                break
-                            except ValueError:
-                                pass
+                        amount, currency = reward_match.group("amount_before", "currency_before")
+                    mission_details["reward_amount"] = int(amount.replace(",", ""))
+                    mission_details["reward_currency"] = currency
+                    logger.debug("Extracted reward: %s %s", mission_details['reward_amount'], mission_details['reward_currency'])
         
         # If we didn't find a mission giver from characters, fall back to more general patterns
         if not mission_details["giver"]:
             logger.info("No mission giver found in character dialogue, falling back to general patterns")
             
             # Look for figure of authority patterns
-            giver_match = re.search(r'figure of (\w+ Corp|[A-Z][a-z]+)', story_text) 
+            giver_match = FALLBACK_GIVER_RE.search(story_text)
             if giver_match:
                 mission_details["giver"] = giver_match.group(1)
-                logger.info(f"Extracted giver from general text: {mission_details['giver']}")
+                logger.debug("Extracted giver from general text: %s", mission_details['giver'])
                 
             # Look for mission briefings without specific character dialogue
-            target_match = re.search(r'on (\w+\'s) plans|against (\w+)', story_text)
+            target_match = FALLBACK_TARGET_RE.search(story_text)
             if target_match:
                 target = target_match.group(1) if target_match.group(1) else target_match.group(2)
                 if target and "'s" in target:
                     target = target.replace("'s", "")
                 mission_details["target"] = target
-                logger.info(f"Extracted target from general text: {mission_details['target']}")
+                logger.debug("Extracted target from general text: %s", mission_details['target'])
                 
-            objective_match = re.search(r'mission(?:—|\s+is\s+to|\s+to)(.+?)[\.\']', story_text)
+            objective_match = FALLBACK_OBJECTIVE_RE.search(story_text)
             if objective_match:
                 mission_details["objective"] = objective_match.group(1).strip()
-                logger.info(f"Extracted objective from general text: {mission_details['objective']}")
+                logger.debug("Extracted objective from general text: %s", mission_details['objective'])
                 
-            reward_match = re.search(r'reward\?\s*(\d{1,3}(?:,\d{3})*|\d+)\s*([💎💵💷💶💴])', story_text)
+            reward_match = None
+            if "reward" in story_text:
+                reward_match = FALLBACK_REWARD_RE.search(story_text)
             if reward_match:
                 try:
                     mission_details["reward_amount"] = int(reward_match.group(1).replace(",", ""))
                     mission_details["reward_currency"] = reward_match.group(2)
-                    logger.info(f"Extracted reward from general text: {mission_details['reward_amount']} {mission_details['reward_currency']}")
+                    logger.debug("Extracted reward from general text: %s %s", mission_details['reward_amount'], mission_details['reward_currency'])
                 except ValueError:
                     pass
         
         # If we have a target name but no ID, try to find the ID from characters list
+        # An exact name is a dict lookup; only a partial name (e.g. a surname)
+        # needs the substring scan over the character names
         if mission_details["target"] and not mission_details["target_id"] and characters:
+            target = mission_details["target"]
+            ids_by_name = {}
             for char in characters:
                 char_name = char.get('character_name') or char.get('name')
-                if char_name and mission_details["target"] in char_name:
-                    mission_details["target_id"] = char.get('id')
-                    logger.info(f"Linked target name to character ID: {mission_details['target_id']}")
-                    break
+                if char_name:
+                    ids_by_name.setdefault(char_name, char.get('id'))
+            if target in ids_by_name:
+                mission_details["target_id"] = ids_by_name[target]
+            else:
+                mission_details["target_id"] = next(
+                    (char_id for char_name, char_id in ids_by_name.items() if target in char_name), None
+                )
+            if mission_details["target_id"]:
+                logger.debug("Linked target name to character ID: %s", mission_details['target_id'])
         
-        # Determine difficulty based on reward amount
-        if mission_details["reward_amount"] > BASE_REWARDS[mission_details["reward_currency"]] * 2.5:
-            mission_details["difficulty"] = "hard"
-        elif mission_details["reward_amount"] > BASE_REWARDS[mission_details["reward_currency"]] * 1.5:
-            mission_details["difficulty"] = "medium"
+        # Determine difficulty based on reward amount; without a recognised
+        # currency (the default is '') there are no thresholds to compare against
+        thresholds = DIFFICULTY_THRESHOLDS.get(mission_details["reward_currency"])
+        reward_amount = mission_details["reward_amount"]
+        if thresholds is None:
+            difficulty = "easy"
+        elif reward_amount > thresholds[1]:
+            difficulty = "hard"
+        elif reward_amount > thresholds[0]:
+            difficulty = "medium"
         else:
-            mission_details["difficulty"] = "easy"
+            difficulty = "easy"
+        mission_details["difficulty"] = difficulty
         
-        logger.info(f"Mission difficulty set to: {mission_details['difficulty']}")
+        logger.debug("Mission difficulty set to: %s", mission_details['difficulty'])
         
         # Log final extracted mission details
-        logger.info("==== EXTRACTED MISSION DETAILS ====")
-        logger.info(f"Giver: {mission_details['giver']} (ID: {mission_details['giver_id']})")
-        logger.info(f"Target: {mission_details['target']} (ID: {mission_details['target_id']})")
-        logger.info(f"Objective: {mission_details['objective']}")
-        logger.info(f"Deadline: {mission_details['deadline']}")
-        logger.info(f"Reward: {mission_details['reward_amount']} {mission_details['reward_currency']}")
-        logger.info(f"Difficulty: {mission_details['difficulty']}")
-        logger.info("===================================")
+        logger.info(
+            "Extracted mission details: giver=%s (ID: %s), target=%s (ID: %s), objective=%s, "
+            "deadline=%s, reward=%s %s, difficulty=%s",
+            mission_details['giver'], mission_details['giver_id'],
+            mission_details['target'], mission_details['target_id'],
+            mission_details['objective'], mission_details['deadline'],
+            mission_details['reward_amount'], mission_details['reward_currency'],
+            mission_details['difficulty']
+        )
         
-        # Keep the existing debug logging for detailed output
-        logger.debug(f"Extracted Mission Details: {json.dumps(mission_details, indent=2)}")
+        # Keep the existing debug logging for detailed output; the dump is only
+        # built when DEBUG is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extracted Mission Details: %s", json.dumps(mission_details, indent=2))
         return mission_details
 
     except Exception as e:
-        logger.error(f"Failed to extract mission details: {e}", exc_info=True)
+        logger.error("Failed to extract mission details: %s", e, exc_info=True)
         return None
 
 
-def create_mission_from_story(user_id: str, story_text: str, story_id: Optional[int] = None, characters: Optional[List[Dict]] = None) -> Optional[Mission]:
+def find_character_ids(names: List[str], characters: Optional[List[Dict]] = None) -> Dict[str, Optional[int]]:
     """
-    Creates a structured mission from story content, integrating it with game systems.
+    Resolve character names to IDs, matching any character whose name contains
+    the given name (case-insensitive).
     
-    This function:
-    1. Extracts mission details from character dialogue in the story
-    2. Links mission to relevant characters (giver and target)
-    3. Sets appropriate difficulty and rewards
-    4. Integrates with user progress tracking
+    Names are looked up in the story's character list first; the rest go to the
+    database as one indexed exact-name query, and only names still unresolved
+    fall back to a single substring (ILIKE) query.
+    
+    Args:
+        names (List[str]): Character names to resolve
+        characters (Optional[List[Dict]]): Characters already loaded for the story
+        
+    Returns:
+        Dict[str, Optional[int]]: ID for each name, or None if no character matched
+    """
+    resolved = dict.fromkeys(names)
+    known = [
+        ((char.get('character_name') or char.get('name') or '').lower(), char.get('id'))
+        for char in characters or []
+    ]
+    unresolved = []
+    for name in resolved:
+        needle = name.lower()
+        resolved[name] = next((char_id for char_name, char_id in known if char_id and needle in char_name), None)
+        if resolved[name] is None:
+            unresolved.append(name)
+    
+    if unresolved:
+        # Exact (case-insensitive) names first, served by the lower(character_name) index
+        rows = db.session.query(Character.id, func.lower(Character.character_name).label('name')).filter(
+            func.lower(Character.character_name).in_([name.lower() for name in unresolved])
+        ).all()
+        exact_ids = {row.name: row.id for row in rows}
+        for name in unresolved:
+            resolved[name] = exact_ids.get(name.lower())
+        unresolved = [name for name in unresolved if resolved[name] is None]
+    
+    if unresolved:
+        # Only names with no exact match fall back to the substring scan
+        rows = db.session.query(Character.id, Character.character_name).filter(
+            or_(*(Character.character_name.ilike(f"%{name}%") for name in unresolved))
+        ).all()
+        for name in unresolved:
+            needle = name.lower()
+            resolved[name] = next((row.id for row in rows if needle in row.character_name.lower()), None)
+    return resolved
+
+
+def build_mission_from_story(user_id: str, story_text: str, story_id: Optional[int] = None, characters: Optional[List[Dict]] = None, assigned_at: Optional[str] = None) -> Optional[Mission]:
+    """
+    Build an unsaved mission from story content.
+    
+    Extracts the mission details, links the giver and target characters and
+    fills in title, description, difficulty and rewards. Nothing is added to
+    the session; see create_mission_from_story and create_missions_bulk.
     
     Args:
         user_id (str): ID of the player
         story_text (str): Generated story text containing mission information
         story_id (Optional[int]): ID of the related story segment
         characters (Optional[List[Dict]]): List of characters in the story
+        assigned_at (Optional[str]): ISO timestamp for the "Mission assigned"
+            entry; defaults to now
         
     Returns:
-        Optional[Mission]: Fully configured mission object ready for gameplay
+        Optional[Mission]: New transient mission, or None if no details were found
     """
-    logger.info(f"Creating mission from story for user {user_id}")
-    
     details = extract_mission_details(story_text, characters)
     if not details:
         logger.warning("No mission details extracted from story.")
         return None
 
-    try:
-        # Check if we already have character IDs from the details
-        giver_id = details.get('giver_id')
-        target_id = details.get('target_id')
-        
-        # If not, try to find characters in the database
+    # Check if we already have character IDs from the details
+    giver_id = details.get('giver_id')
+    target_id = details.get('target_id')
+    
+    # If not, resolve the names against the story's characters, then the database
+    lookup_names = []
+    if not giver_id and details['giver']:
+        lookup_names.append(details['giver'])
+    if not target_id and details['target']:
+        lookup_names.append(details['target'])
+    if lookup_names:
+        logger.info("Looking up characters by name: %s", lookup_names)
+        found_ids = find_character_ids(lookup_names, characters)
         if not giver_id and details['giver']:
-            logger.info(f"Looking up giver character in database: {details['giver']}")
-            giver = Character.query.filter(
-                Character.name.ilike(f"%{details['giver']}%")
-            ).first()
-            giver_id = giver.id if giver else None
+            giver_id = found_ids[details['giver']]
             if giver_id:
-                logger.info(f"Found giver character in database: ID {giver_id}")
+                logger.info("Found giver character: ID %s", giver_id)
             else:
-                logger.warning(f"Could not find giver character in database: {details['giver']}")
-            
+                logger.warning("Could not find giver character in database: %s", details['giver'])
         if not target_id and details['target']:
-            logger.info(f"Looking up target character in database: {details['target']}")
-            target = Character.query.filter(
-                Character.name.ilike(f"%{details['target']}%")
-            ).first()
-            target_id = target.id if target else None
+            target_id = found_ids[details['target']]
             if target_id:
-                logger.info(f"Found target character in database: ID {target_id}")
+                logger.info("Found target character: ID %s", target_id)
             else:
-                logger.warning(f"Could not find target character in database: {details['target']}")
-
-        # Generate a title based on objective
-        title = f"Mission: {details['objective'][:30]}..." if len(details['objective']) > 30 else f"Mission: {details['objective']}"
-        logger.info(f"Generated mission title: {title}")
-
-        # Create description from extracted details
-        description = f"Mission from {details['giver'] if details['giver'] else 'Unknown'} to {details['objective']}. "
-        description += f"Target: {details['target'] if details['target'] else 'Unknown'}. "
-        description += f"Reward: {details['reward_amount']} {details['reward_currency']}."
-        logger.info(f"Generated mission description: {description}")
-
-        # Create mission with all required fields from database schema
-        logger.info("Creating mission in database...")
-        mission = Mission(
-            user_id=user_id,
-            title=title,
-            description=description,
-            giver_id=giver_id,
-            target_id=target_id,
-            objective=details['objective'],
-            status='active',
-            difficulty=details['difficulty'],
-            reward_currency=details['reward_currency'],
-            reward_amount=details['reward_amount'],
-            deadline=details['deadline'],
-            story_id=story_id,
-            progress=0,
-            progress_updates=[{
-                "progress": 0,
-                "status": "active",
-                "timestamp": datetime.utcnow().isoformat(),
-                "description": "Mission assigned"
-            }]
-        )
+                logger.warning("Could not find target character in database: %s", details['target'])
+
+    # Generate a title based on objective
+    title = f"Mission: {details['objective'][:30]}..." if len(details['objective']) > 30 else f"Mission: {details['objective']}"
+    logger.info("Generated mission title: %s", title)
+
+    # Create description from extracted details
+    description = f"Mission from {details['giver'] if details['giver'] else 'Unknown'} to {details['objective']}. "
+    description += f"Target: {details['target'] if details['target'] else 'Unknown'}. "
+    description += f"Reward: {details['reward_amount']} {details['reward_currency']}."
+    logger.info("Generated mission description: %s", description)
+
+    # Create mission with all required fields from database schema
+    return Mission(
+        user_id=user_id,
+        title=title,
+        description=description,
+        giver_id=giver_id,
+        target_id=target_id,
+        objective=details['objective'],
+        status='active',
+        difficulty=details['difficulty'],
+        reward_currency=details['reward_currency'],
+        reward_amount=details['reward_amount'],
+        deadline=details['deadline'],
+        story_id=story_id,
+        progress=0,
+        progress_updates=[{
+            "progress": 0,
+            "status": "active",
+            "timestamp": assigned_at or datetime.utcnow().isoformat(),
+            "description": "Mission assigned"
+        }]
+    )
+
+
+def create_mission_from_story(user_id: str, story_text: str, story_id: Optional[int] = None, characters: Optional[List[Dict]] = None) -> Optional[Mission]:
+    """
+    Creates a structured mission from story content, integrating it with game systems.
+    
+    This function:
+    1. Extracts mission details from character dialogue in the story
+    2. Links mission to relevant characters (giver and target)
+    3. Sets appropriate difficulty and rewards
+    4. Integrates with user progress tracking
+    
+    Args:
+        user_id (str): ID of the player
+        story_text (str): Generated story text containing mission information
+        story_id (Optional[int]): ID of the related story segment
+        characters (Optional[List[Dict]]): List of characters in the story
+        
+    Returns:
+        Optional[Mission]: Fully configured mission object ready for gameplay
+    """
+    logger.info("Creating mission from story for user %s", user_id)
+    
+    try:
+        mission = build_mission_from_story(user_id, story_text, story_id, characters)
+        if not mission:
+            return None
         
+        # Flush to get mission.id; the mission and the active-missions update
+        # below are committed together
         db.session.add(mission)
-        db.session.commit()
-        logger.info(f"Created mission in database with ID: {mission.id}")
+        db.session.flush()
+        logger.info("Created mission in database with ID: %s", mission.id)
         
         # Add to user's active missions
-        logger.info(f"Adding mission to user's active missions list")
+        logger.info("Adding mission to user's active missions list")
         user_progress = UserProgress.query.filter_by(user_id=user_id).first()
         if user_progress:
             if not user_progress.active_missions:
@@ -363,23 +463,92 @@ def create_mission_from_story(user_id: str, story_text: str, story_id: Optional[
             
             if mission.id not in user_progress.active_missions:
                 user_progress.active_missions.append(mission.id)
-                db.session.commit()
-                logger.info(f"Added mission {mission.id} to user {user_id}'s active missions")
+                flag_modified(user_progress, 'active_missions')
+                logger.info("Added mission %s to user %s's active missions", mission.id, user_id)
             else:
-                logger.info(f"Mission {mission.id} was already in user's active missions")
+                logger.info("Mission %s was already in user's active missions", mission.id)
         else:
-            logger.warning(f"Could not find UserProgress for user {user_id}")
+            logger.warning("Could not find UserProgress for user %s", user_id)
+        db.session.commit()
         
-        logger.info(f"✅ Successfully created mission from story: '{mission.title}'")
-        logger.info(f"Mission details: {mission.objective} | Difficulty: {mission.difficulty} | Reward: {mission.reward_amount} {mission.reward_currency}")
+        logger.info("✅ Successfully created mission from story: '%s'", mission.title)
+        logger.info("Mission details: %s | Difficulty: %s | Reward: %s %s", mission.objective, mission.difficulty, mission.reward_amount, mission.reward_currency)
         return mission
         
     except Exception as e:
-        logger.error(f"Error creating mission from story: {str(e)}")
+        logger.error("Error creating mission from story: %s", e)
         db.session.rollback()
         return None
 
 
+def create_missions_bulk(user_id: str, stories: List[Dict[str, Any]]) -> List[Mission]:
+    """
+    Create missions from several stories with one insert and one commit.
+    
+    Each story is turned into a mission as in create_mission_from_story; stories
+    that yield no mission are skipped. All missions are inserted in a single
+    flush, added to the user's active missions together and committed once.
+    
+    Args:
+        user_id (str): ID of the player
+        stories (List[Dict[str, Any]]): Items with 'story_text' and optionally
+            'story_id' and 'characters'
+        
+    Returns:
+        List[Mission]: The created missions (empty on failure)
+    """
+    logger.info("Creating missions from %s stories for user %s", len(stories), user_id)
+    
+    try:
+        # Missions assigned in one batch share one timestamp
+        assigned_at = datetime.utcnow().isoformat()
+        missions = []
+        for story in stories:
+            mission = build_mission_from_story(
+                user_id,
+                story['story_text'],
+                story.get('story_id'),
+                story.get('characters'),
+                assigned_at
+            )
+            if mission:
+                missions.append(mission)
+        if not missions:
+            return []
+        
+        # One flush inserts every mission and assigns their IDs
+        db.session.add_all(missions)
+        db.session.flush()
+        
+        # Add all new missions to the user's active missions in one update
+        user_progress = UserProgress.query.filter_by(user_id=user_id).first()
+        if user_progress:
+            active_missions = list(user_progress.active_missions or [])
+            known_ids = set(active_missions)
+            active_missions.extend(mission.id for mission in missions if mission.id not in known_ids)
+            user_progress.active_missions = active_missions
+        else:
+            logger.warning("Could not find UserProgress for user %s", user_id)
+        db.session.commit()
+        
+        logger.info("Created %s missions for user %s", len(missions), user_id)
+        return missions
+        
+    except Exception as e:
+        logger.error("Error creating missions in bulk: %s", e)
+        db.session.rollback()
+        return []
+
+
+def parse_story_data(raw: str) -> Dict[str, Any]:
+    """
+    Parse a story's generated_story text with orjson.
+    
+    Each call returns a freshly parsed dict that the caller may modify.
+    """
+    return orjson.loads(raw)
+
+
 def generate_mission(user_id: str, story_id: Optional[int] = None) -> Optional[Mission]:
     """
     Generate a new mission either from story content or dynamically.
@@ -400,17 +569,18 @@ def generate_mission(user_id: str, story_id: Optional[int] = None) -> Optional[M
     try:
         # If story_id is provided, try to extract mission from that story
         if story_id:
-            # Get story from database and ensure it's committed
-            story = StoryGeneration.query.get(story_id)
+            # Get story from database in one SELECT of just the columns used here;
+            # populate_existing refreshes an already-loaded instance with the
+            # latest committed data, so no separate refresh() is needed
+            story = StoryGeneration.query.options(
+                load_only(StoryGeneration.id, StoryGeneration.generated_story)
+            ).execution_options(populate_existing=True).filter_by(id=story_id).first()
             if not story:
-                logger.error(f"Story with ID {story_id} not found in database")
+                logger.error("Story with ID %s not found in database", story_id)
                 return None
-                
-            # Ensure we have the latest data from the database
-            db.session.refresh(story)
             
             if not story.generated_story:
-                logger.error(f"Story {story_id} has no generated story data")
+                logger.error("Story %s has no generated story data", story_id)
                 return None
                 
             # Try to parse the story content - handle both string and dict
@@ -418,9 +588,9 @@ def generate_mission(user_id: str, story_id: Optional[int] = None) -> Optional[M
                 story_data = story.generated_story
                 if isinstance(story_data, str):
                     try:
-                        story_data = json.loads(story_data)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse story JSON: {str(e)}")
+                        story_data = parse_story_data(story_data)
+                    except orjson.JSONDecodeError as e:
+                        logger.error("Failed to parse story JSON: %s", e)
                         # If JSON parsing fails, try to use the raw story text
                         return create_mission_from_story(user_id, story_data, story_id)
                 
@@ -432,27 +602,23 @@ def generate_mission(user_id: str, story_id: Optional[int] = None) -> Optional[M
                     giver_id = None
                     target_id = None
                     
-                    # If giver_id is provided directly
+                    # If giver_id / target_id are provided directly use them, otherwise
+                    # resolve the names together in one lookup
                     if mission_data.get('giver_id') and str(mission_data['giver_id']).isdigit():
                         giver_id = int(mission_data['giver_id'])
-                    # Otherwise try to find by name
-                    elif mission_data.get('giver'):
-                        giver = Character.query.filter(
-                            Character.name.ilike(f"%{mission_data['giver']}%")
-                        ).first()
-                        if giver:
-                            giver_id = giver.id
-                    
-                    # If target_id is provided directly  
                     if mission_data.get('target_id') and str(mission_data['target_id']).isdigit():
                         target_id = int(mission_data['target_id'])
-                    # Otherwise try to find by name
-                    elif mission_data.get('target'):
-                        target = Character.query.filter(
-                            Character.name.ilike(f"%{mission_data['target']}%")
-                        ).first()
-                        if target:
-                            target_id = target.id
+                    lookup_names = []
+                    if not giver_id and mission_data.get('giver'):
+                        lookup_names.append(mission_data['giver'])
+                    if not target_id and mission_data.get('target'):
+                        lookup_names.append(mission_data['target'])
+                    if lookup_names:
+                        found_ids = find_character_ids(lookup_names)
+                        if not giver_id and mission_data.get('giver'):
+                            giver_id = found_ids[mission_data['giver']]
+                        if not target_id and mission_data.get('target'):
+                            target_id = found_ids[mission_data['target']]
                             
                     # Create the mission
                     mission = Mission(
@@ -476,8 +642,9 @@ def generate_mission(user_id: str, story_id: Optional[int] = None) -> Optional[M
                         }]
                     )
                     
+                    # Flush to get mission.id and commit once with the progress update
                     db.session.add(mission)
-                    db.session.commit()
+                    db.session.flush()
                     
                     # Add to user's active missions
                     user_progress = UserProgress.query.filter_by(user_id=user_id).first()
@@ -487,9 +654,10 @@ def generate_mission(user_id: str, story_id: Optional[int] = None) -> Optional[M
                             
                         if mission.id not in user_progress.active_missions:
                             user_progress.active_missions.append(mission.id)
-                            db.session.commit()
+                            flag_modified(user_progress, 'active_missions')
+                    db.session.commit()
                     
-                    logger.info(f"Created mission from story JSON for user {user_id}: {mission.title}")
+                    logger.info("Created mission from story JSON for user %s: %s", user_id, mission.title)
                     return mission
                 
                 # If no mission in the JSON, try to extract from story text
@@ -497,7 +665,7 @@ def generate_mission(user_id: str, story_id: Optional[int] = None) -> Optional[M
                     return create_mission_from_story(user_id, story_data['story'], story_id)
                 
             except Exception as e:
-                logger.error(f"Error parsing story data: {str(e)}")
+                logger.error("Error parsing story data: %s", e)
                 # If JSON parsing fails, try to use the raw story text
                 if isinstance(story.generated_story, str):
                     return create_mission_from_story(user_id, story.generated_story, story_id)
@@ -507,11 +675,12 @@ def generate_mission(user_id: str, story_id: Optional[int] = None) -> Optional[M
                         return create_mission_from_story(user_id, story_text, story_id)
         
         # If we didn't create a mission from story, fall back to getting a recent story
-        recent_story = StoryGeneration.query.filter_by(user_id=user_id).order_by(StoryGeneration.created_at.desc()).first()
+        recent_story = StoryGeneration.query.options(
+            load_only(StoryGeneration.id, StoryGeneration.generated_story)
+        ).execution_options(populate_existing=True).filter_by(
+            user_id=user_id
+        ).order_by(StoryGeneration.created_at.desc()).first()
         if recent_story and recent_story.generated_story:
-            # Ensure we have the latest data
-            db.session.refresh(recent_story)
-            
             if isinstance(recent_story.generated_story, str):
                 return create_mission_from_story(user_id, recent_story.generated_story, recent_story.id)
             elif isinstance(recent_story.generated_story, dict):
@@ -520,11 +689,11 @@ def generate_mission(user_id: str, story_id: Optional[int] = None) -> Optional[M
                     return create_mission_from_story(user_id, story_text, recent_story.id)
         
         # If we still don't have a mission, log that we couldn't generate one
-        logger.warning(f"Could not generate mission for user {user_id}")
+        logger.warning("Could not generate mission for user %s", user_id)
         return None
         
     except Exception as e:
-        logger.error(f"Error generating mission: {str(e)}")
+        logger.error("Error generating mission: %s", e)
         db.session.rollback()
         return None
 
@@ -539,6 +708,25 @@ def get_mission_by_id(mission_id: int) -> Optional[Mission]:
     return Mission.query.get(mission_id)
 
 
+def append_progress_update(mission: Mission, update: Dict[str, Any]):
+    """
+    Append an entry to a mission's progress_updates log.
+    
+    The entry is concatenated onto the JSONB array in SQL, so the existing log
+    is neither loaded nor re-sent; the in-memory attribute is expired and
+    reloads on next access.
+    """
+    db.session.query(Mission).filter(Mission.id == mission.id).update(
+        {
+            Mission.progress_updates: func.coalesce(
+                Mission.progress_updates, cast('[]', JSONB)
+            ).op('||')(cast(json.dumps([update]), JSONB))
+        },
+        synchronize_session=False
+    )
+    db.session.expire(mission, ['progress_updates'])
+
+
 def update_mission_progress(mission_id: int, progress: int, description: Optional[str] = None) -> bool:
     """Update progress on a mission"""
     mission = get_mission_by_id(mission_id)
@@ -548,25 +736,41 @@ def update_mission_progress(mission_id: int, progress: int, description: Optiona
     return mission.update_progress(progress, description)
 
 
+def move_mission_id(user_progress: UserProgress, mission_id: int, to_list: str) -> None:
+    """
+    Move a mission ID out of the user's active missions and onto another ID list.
+    
+    The active list is filtered in one pass and both lists are reassigned rather
+    than mutated in place, so the JSON column changes are always detected.
+    
+    Args:
+        user_progress (UserProgress): The user's progress record
+        mission_id (int): Mission to move
+        to_list (str): Destination attribute, e.g. 'completed_missions'
+    """
+    user_progress.active_missions = [
+        active_id for active_id in user_progress.active_missions or [] if active_id != mission_id
+    ]
+    setattr(user_progress, to_list, [*(getattr(user_progress, to_list) or []), mission_id])
+
+
 def complete_mission(mission_id: int, user_id: str) -> bool:
     """Mark a mission as completed and award the reward"""
     mission = get_mission_by_id(mission_id)
     if not mission or mission.status != 'active':
         return False
     
-    # Update mission status
+    # Update mission status; the completion time and its log entry share one timestamp
+    now = datetime.utcnow()
     mission.status = 'completed'
-    mission.completed_at = datetime.utcnow()
+    mission.completed_at = now
     mission.progress = 100
     
     # Add progress update
-    if not mission.progress_updates:
-        mission.progress_updates = []
-    
-    mission.progress_updates.append({
+    append_progress_update(mission, {
         "progress": 100,
         "status": "completed",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": now.isoformat(),
         "description": "Mission successfully completed!"
     })
     
@@ -574,15 +778,7 @@ def complete_mission(mission_id: int, user_id: str) -> bool:
     user_progress = UserProgress.query.filter_by(user_id=user_id).first()
     if user_progress:
         # Move mission from active to completed list
-        if not user_progress.active_missions:
-            user_progress.active_missions = []
-        if not user_progress.completed_missions:
-            user_progress.completed_missions = []
-            
-        if mission.id in user_progress.active_missions:
-            user_progress.active_missions.remove(mission.id)
-            
-        user_progress.completed_missions.append(mission.id)
+        move_mission_id(user_progress, mission.id, 'completed_missions')
         
         # Add currency reward
         if mission.reward_currency in user_progress.currency_balances:
@@ -629,9 +825,6 @@ def fail_mission(mission_id: int, user_id: str, reason: Optional[str] = None) ->
     mission.status = 'failed'
     
     # Add progress update
-    if not mission.progress_updates:
-        mission.progress_updates = []
-    
     update = {
         "status": "failed",
         "timestamp": datetime.utcnow().isoformat()
@@ -640,21 +833,13 @@ def fail_mission(mission_id: int, user_id: str, reason: Optional[str] = None) ->
     if reason:
         update["reason"] = reason
         
-    mission.progress_updates.append(update)
+    append_progress_update(mission, update)
     
     # Update user progress
     user_progress = UserProgress.query.filter_by(user_id=user_id).first()
     if user_progress:
         # Move mission from active to failed list
-        if not user_progress.active_missions:
-            user_progress.active_missions = []
-        if not user_progress.failed_missions:
-            user_progress.failed_missions = []
-            
-        if mission.id in user_progress.active_missions:
-            user_progress.active_missions.remove(mission.id)
-            
-        user_progress.failed_missions.append(mission.id)
+        move_mission_id(user_progress, mission.id, 'failed_missions')
         
         # Worsen relationship with mission giver
         if mission.giver_id:
@@ -0,0 +1,65 @@
+"""
+Mission Text Patterns
+=====================
+
+Regular expressions and the dialogue scanner used by mission_generator to read
+mission details out of generated story text. Kept free of database and model imports so they can be
+used and tested on their own.
+"""
+
+import re
+from typing import Any, Dict, Iterator, Tuple
+
+# Patterns for reading mission components out of a mission giver's dialogue,
+# compiled once at import. Each category's phrasings are folded into one
+# alternation so the dialogue is scanned once per category.
+VILLAIN_RE = re.compile(
+    r"(?:(?:defeat|stop|investigate|find|locate|capture|eliminate|monitor)"
+    r"|(?:target|villain|enemy|opponent) (?:is|will be)) "
+    r"([A-Z][a-z]+ [A-Z][a-z]+|[A-Z][a-z]+)"
+)
+OBJECTIVE_RE = re.compile(
+    r"(?:need you to|your mission is to|objective is to|assignment is to|task is to) ([^\.]+)"
+)
+DEADLINE_RE = re.compile(
+    r"(?:within|deadline is|must be completed in|you have) (\d+) (days|hours|weeks)"
+)
+# The amount/currency pair comes either after the reward phrase or before "reward"
+REWARD_RE = re.compile(
+    r"(?:reward of|pay you|payment of) (?P<amount>\d{1,3}(?:,\d{3})*|\d+)\s*(?P<currency>[💎💵💷💶💴])"
+    r"|(?P<amount_before>\d{1,3}(?:,\d{3})*|\d+)\s*(?P<currency_before>[💎💵💷💶💴]) reward"
+)
+
+# Substrings every deadline match must contain; a dialogue without any of them
+# skips DEADLINE_RE entirely
+DEADLINE_ANCHORS = ("within", "deadline", "completed", "have ")
+
+# Fallback patterns run over the whole story when no giver dialogue was found
+FALLBACK_GIVER_RE = re.compile(r'figure of (\w+ Corp|[A-Z][a-z]+)')
+FALLBACK_TARGET_RE = re.compile(r'on (\w+\'s) plans|against (\w+)')
+FALLBACK_OBJECTIVE_RE = re.compile(r'mission(?:—|\s+is\s+to|\s+to)(.+?)[\.\']')
+FALLBACK_REWARD_RE = re.compile(r'reward\?\s*(\d{1,3}(?:,\d{3})*|\d+)\s*([💎💵💷💶💴])')
+
+def iter_speaker_dialogue(story_text: str, speakers: Dict[str, Any]) -> Iterator[Tuple[str, Any, str]]:
+    """
+    Yield (name, speaker, passage) for each quoted passage introduced by a speaker's name.
+
+    The story is split on double quotes once, so every quoted passage and the
+    narration before it are available without rescanning the text. A passage
+    belongs to the speaker named last in the narration leading up to it; names
+    that only appear inside other passages don't count.
+
+    Args:
+        story_text: Text to scan
+        speakers: Speaker objects keyed by the name to look for
+    """
+    if not speakers:
+        return
+    parts = story_text.split('"')
+    # Odd parts are quoted passages; a trailing odd part without a closing quote is dropped
+    for index in range(1, len(parts) - 1, 2):
+        narration = parts[index - 1]
+        # Last mention wins; on a tie ("Anna" inside "Anna Bell") the longer name does
+        name = max(speakers, key=lambda speaker: (narration.rfind(speaker), len(speaker)))
+        if narration.rfind(name) >= 0:
+            yield name, speakers[name], parts[index]
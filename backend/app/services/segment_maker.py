@@ -586,7 +586,8 @@ class StoryContinuationHandler:
         
         # Process and validate the response
         validated_data = self.validate_response(response, mission)
-        logger.debug(f"Validated continuation data: {json.dumps(validated_data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Validated continuation data: %s", json.dumps(validated_data, indent=2))
         
         return validated_data
 
@@ -926,7 +927,8 @@ class StoryContinuationHandler:
         
         # Process and validate the response
         validated_data = self.validate_response(response, mission)
-        logger.debug(f"Validated continuation data: {json.dumps(validated_data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Validated continuation data: %s", json.dumps(validated_data, indent=2))
         
         return validated_data
 
@@ -32,8 +32,12 @@ Dependencies:
 """
 
 import logging
-from typing import Dict, Any, Optional, List
-import json
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional, List, Tuple
+import orjson
+from sqlalchemy import Integer, cast, func, literal, select
+from sqlalchemy.orm import aliased, load_only
 from models import UserProgress, StoryGeneration, StoryNode, Mission, PlotArc
 from models.character_data import Character
 from database import db
@@ -45,6 +49,24 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 logging.getLogger("httpx").setLevel(logging.DEBUG)
 
+# Number of ancestor nodes included as recent history in enhanced context
+MAX_ANCESTORS = 5
+
+# StoryNode columns read from a game state's current node (to_dict, story
+# parameters, continuation); the rest are deferred until first accessed
+NODE_STATE_COLUMNS = (
+    StoryNode.id,
+    StoryNode.story_id,
+    StoryNode.parent_node_id,
+    StoryNode.narrative_text,
+    StoryNode.is_endpoint,
+    StoryNode.branch_metadata
+)
+
+def _snapshot(value: Any) -> bytes:
+    """Serialize a state value for change detection; non-string keys are stringified, as the json module did."""
+    return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
 class GameState:
     """
     Represents the current state of a user's game session.
@@ -75,8 +97,17 @@ class GameState:
         # Track story node count separately (not in context manager)
         self._node_count = 0
         # NEW: Add story history buffer to maintain recent nodes for context
-        self._story_history_buffer = []
         self._max_history_nodes = 3  # Keep last 3 nodes
+        self._story_history_buffer = deque(maxlen=self._max_history_nodes)
+        # Set view of user_progress.choice_history for O(1) membership checks, with
+        # the list object and length it was built from
+        self._choice_history_set = None
+        self._choice_history_list = None
+        self._choice_history_len = 0
+        # Story, node and mission IDs the loaded objects were fetched for
+        self._loaded_state_key = None
+        # to_dict's story and node sections, with the objects they were built from
+        self._sections_cache = (None, None, None, None)
         self.reload_state()
         # After reload, try to get the node count from the dedicated column
         if self.user_progress and self.user_progress.node_count:
@@ -95,26 +126,28 @@ class GameState:
         logger.debug(f"Getting node count: {self._node_count}")
         return self._node_count
         
-    def increment_node_count(self) -> int:
-        """Increment and return the node count."""
+    def increment_node_count(self, commit: bool = True) -> int:
+        """
+        Increment and return the node count.
+        
+        Args:
+            commit (bool): Commit the new count immediately; pass False when the
+                caller commits its own transaction afterwards
+        """
         self._node_count += 1
         logger.info(f"=== Node count incremented to {self._node_count} ===")
         
-        # Update the dedicated node_count column using ORM
-        try:
-            # Use the dedicated column instead of extra_data
-            self.user_progress.node_count = self._node_count
-            
-            # Add the user_progress object to the session and commit the change
-            db.session.add(self.user_progress)
-            db.session.commit()
-            
-            logger.info(f"Persisted node_count {self._node_count} to database for user {self.user_id}")
-            
-        except Exception as e:
-            logger.error(f"Failed to persist node count: {str(e)}", exc_info=True)
-            db.session.rollback()
-            # Don't rollback, we still want to return the incremented count
+        # Update the dedicated node_count column; user_progress is already in the
+        # session, so without commit the change simply rides the caller's commit
+        self.user_progress.node_count = self._node_count
+        if commit:
+            try:
+                db.session.commit()
+                logger.info(f"Persisted node_count {self._node_count} to database for user {self.user_id}")
+            except Exception as e:
+                logger.error(f"Failed to persist node count: {str(e)}", exc_info=True)
+                # Roll back the failed commit, but still return the incremented count
+                db.session.rollback()
             
         return self._node_count
 
@@ -132,29 +165,53 @@ class GameState:
                 - protagonist_gender: Gender of protagonist
                 - node_count: Current depth in story
         """
-        if not self.current_story:
+        story = self.current_story
+        if not story:
             logger.warning("Cannot get story parameters: no current story")
             return {}
             
         protagonist = {}
-        if self.current_node and self.current_node.branch_metadata:
-            protagonist = self.current_node.branch_metadata.get("protagonist", {})
+        node = self.current_node
+        branch_metadata = node.branch_metadata if node else None
+        if branch_metadata:
+            protagonist = branch_metadata.get("protagonist", {})
             
+        # The story was checked above, so its fields are read directly
         parameters = {
-            "mood": self.current_story.mood if self.current_story else None,
-            "narrative_style": self.current_story.narrative_style if self.current_story else None,
-            "conflict": self.current_story.primary_conflict if self.current_story else None,
-            "setting": self.current_story.setting if self.current_story else None,
+            "mood": story.mood,
+            "narrative_style": story.narrative_style,
+            "conflict": story.primary_conflict,
+            "setting": story.setting,
             "protagonist_name": protagonist.get("name"),
             "protagonist_gender": protagonist.get("gender"),
             "node_count": self._node_count
         }
         
         logger.info("=== Retrieved story parameters ===")
-        logger.debug(f"Story parameters: {json.dumps(parameters, default=str, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Story parameters: %s", orjson.dumps(parameters, default=str, option=orjson.OPT_INDENT_2).decode())
         return parameters
 
-    def get_enhanced_context(self, node_id: int, max_tokens: int = 3000) -> str:
+    def _get_key_node_ids(self, story_id: int) -> Tuple[int, ...]:
+        """
+        Sorted IDs of the key nodes of a story's active plot arcs.
+        
+        The arcs' key_nodes JSONB arrays are unnested in SQL, so only the IDs
+        are read. Node text never changes, so these IDs determine the key plot
+        points of an enhanced context.
+        """
+        key_node_ids = db.session.execute(
+            select(
+                cast(func.jsonb_array_elements_text(PlotArc.key_nodes), Integer)
+            ).where(
+                PlotArc.story_id == story_id,
+                PlotArc.status == 'active'
+            )
+        ).scalars()
+        return tuple(sorted(set(key_node_ids)))
+
+    def get_enhanced_context(self, node_id: int, max_tokens: int = 3000,
+                             key_node_ids: Optional[Tuple[int, ...]] = None) -> str:
         """
         Generate optimized context using key plot points and ancestor nodes.
         
@@ -166,6 +223,8 @@ class GameState:
         Args:
             node_id (int): Current node ID to generate context for
             max_tokens (int): Approximate maximum tokens to include in context
+            key_node_ids (Optional[Tuple[int, ...]]): Key node IDs already read
+                with _get_key_node_ids, to skip reading them again
             
         Returns:
             str: Formatted context text optimized for OpenAI
@@ -180,58 +239,38 @@ class GameState:
                 return ""
             
             # 1. Get key nodes from active plot arcs
-            key_node_ids = []
-            plot_arcs = PlotArc.query.filter(
-                PlotArc.story_id == current_node.story_id,
-                PlotArc.status == 'active'
-            ).all()
-            
-            for arc in plot_arcs:
-                if arc.key_nodes:
-                    # key_nodes is a JSONB array, so we need to extract the IDs
-                    key_node_ids.extend(arc.key_nodes)
+            if key_node_ids is None:
+                key_node_ids = self._get_key_node_ids(current_node.story_id)
+            key_node_texts = [
+                row.narrative_text for row in db.session.query(StoryNode.narrative_text)
+                .filter(StoryNode.id.in_(key_node_ids))
+                .all()
+            ] if key_node_ids else []
             
             # 2. Get ancestors in the node tree path (limit to 5 ancestors)
-            ancestor_nodes = []
-            parent_id = current_node.parent_node_id
-            ancestor_count = 0
-            
-            while parent_id and ancestor_count < 5:
-                parent = StoryNode.query.get(parent_id)
-                if parent:
-                    ancestor_nodes.append(parent)
-                    parent_id = parent.parent_node_id
-                    ancestor_count += 1
-                else:
-                    break
-            
-            # Reverse the ancestors to get chronological order
-            ancestor_nodes.reverse()
+            ancestor_texts = self._get_ancestor_texts(current_node)
             
             # 3. Format context sections
             context_parts = []
             
             # Add key plot points if available
-            if key_node_ids:
-                key_nodes = StoryNode.query.filter(StoryNode.id.in_(key_node_ids)).all()
-                
-                if key_nodes:
-                    context_parts.append("KEY PLOT POINTS:")
-                    for i, node in enumerate(key_nodes, 1):
-                        # Limit text to ~300 characters to manage token count
-                        truncated_text = node.narrative_text[:300]
-                        if len(node.narrative_text) > 300:
-                            truncated_text += "..."
-                        context_parts.append(f"MOMENT {i}: {truncated_text}")
-                    context_parts.append("")  # Empty line for separation
+            if key_node_texts:
+                context_parts.append("KEY PLOT POINTS:")
+                for i, narrative_text in enumerate(key_node_texts, 1):
+                    # Limit text to ~300 characters to manage token count
+                    truncated_text = narrative_text[:300]
+                    if len(narrative_text) > 300:
+                        truncated_text += "..."
+                    context_parts.append(f"MOMENT {i}: {truncated_text}")
+                context_parts.append("")  # Empty line for separation
             
             # Add story ancestors for recent history
-            if ancestor_nodes:
+            if ancestor_texts:
                 context_parts.append("RECENT STORY HISTORY:")
-                for i, node in enumerate(ancestor_nodes, 1):
+                for i, narrative_text in enumerate(ancestor_texts, 1):
                     # Limit text to ~200 characters to manage token count
-                    truncated_text = node.narrative_text[:200]
-                    if len(node.narrative_text) > 200:
+                    truncated_text = narrative_text[:200]
+                    if len(narrative_text) > 200:
                         truncated_text += "..."
                     context_parts.append(f"SCENE {i}: {truncated_text}")
                 context_parts.append("")  # Empty line for separation
@@ -250,7 +289,7 @@ class GameState:
             combined_context = "\n".join(context_parts)
             
             # Log context generation info
-            logger.info(f"Generated enhanced context with {len(key_node_ids)} key nodes and {len(ancestor_nodes)} ancestor nodes")
+            logger.info(f"Generated enhanced context with {len(key_node_texts)} key nodes and {len(ancestor_texts)} ancestor nodes")
             logger.debug(f"Context length: {len(combined_context)} characters")
             
             return combined_context
@@ -259,6 +298,71 @@ class GameState:
             logger.error(f"Error generating enhanced context: {str(e)}", exc_info=True)
             return ""  # Return empty string on error
 
+    def _get_ancestor_texts(self, node: StoryNode) -> Tuple[str, ...]:
+        """
+        Narrative texts of a node's nearest ancestors (up to 5), oldest first.
+        
+        Node text never changes once written, so chains are cached process-wide
+        by node ID. A new node whose parent's chain is cached (the usual case,
+        as each turn continues the previous node) extends that chain without a
+        query; otherwise the chain is fetched with one recursive query, which
+        reaches one level further so the fetched ancestors' own chains can be
+        cached too (sibling branches of the same node then skip the query).
+        """
+        cached = state_manager.get_cached_ancestors(node.id)
+        if cached is not None:
+            return cached
+        
+        if not node.parent_node_id:
+            texts = ()
+        else:
+            parent_chain = state_manager.get_cached_ancestors(node.parent_node_id)
+            # The parent is normally already in the session's identity map
+            parent = StoryNode.query.get(node.parent_node_id) if parent_chain is not None else None
+            if parent is not None:
+                texts = (parent_chain + (parent.narrative_text,))[-MAX_ANCESTORS:]
+            else:
+                # Walk the parent chain in one recursive query instead of one query per
+                # ancestor, one level past MAX_ANCESTORS to complete the parent's chain
+                ancestors = db.session.query(
+                    StoryNode.id,
+                    StoryNode.parent_node_id,
+                    StoryNode.narrative_text,
+                    literal(1).label("depth")
+                ).filter(
+                    StoryNode.id == node.parent_node_id
+                ).cte(name="ancestors", recursive=True)
+                parent_alias = aliased(StoryNode)
+                ancestors = ancestors.union_all(
+                    db.session.query(
+                        parent_alias.id,
+                        parent_alias.parent_node_id,
+                        parent_alias.narrative_text,
+                        ancestors.c.depth + 1
+                    ).filter(
+                        parent_alias.id == ancestors.c.parent_node_id,
+                        ancestors.c.depth <= MAX_ANCESTORS
+                    )
+                )
+                # Nearest ancestor first
+                rows = db.session.query(
+                    ancestors.c.id,
+                    ancestors.c.parent_node_id,
+                    ancestors.c.narrative_text
+                ).order_by(ancestors.c.depth).all()
+                chain = [row.narrative_text for row in rows]
+                texts = tuple(reversed(chain[:MAX_ANCESTORS]))
+                # An ancestor's own chain is known when enough rows follow it, or
+                # when the walk reached the root
+                reached_root = rows[-1].parent_node_id is None if rows else False
+                for position, row in enumerate(rows):
+                    own_chain = chain[position + 1:position + 1 + MAX_ANCESTORS]
+                    if len(own_chain) == MAX_ANCESTORS or reached_root:
+                        state_manager.cache_ancestors(row.id, tuple(reversed(own_chain)))
+        
+        state_manager.cache_ancestors(node.id, texts)
+        return texts
+
     def get_node_context(self, node_id: int) -> Dict[str, Any]:
         """
         Get additional context information for a story node.
@@ -301,7 +405,16 @@ class GameState:
             # Get active missions for this story
             active_missions = []
             if self.user_progress.active_missions:
-                missions = Mission.query.filter(
+                # Only the columns reported below are selected
+                missions = db.session.query(
+                    Mission.id,
+                    Mission.title,
+                    Mission.description,
+                    Mission.status,
+                    Mission.progress,
+                    Mission.reward_currency,
+                    Mission.reward_amount
+                ).filter(
                     Mission.id.in_(self.user_progress.active_missions),
                     Mission.story_id == node.story_id
                 ).all()
@@ -332,8 +445,16 @@ class GameState:
                 ])
                 logger.info(f"Added narrative history from {len(self._story_history_buffer)} previous nodes")
             
-            # NEW: Get enhanced context using key plot points and ancestors
-            enhanced_context = self.get_enhanced_context(node_id)
+            # NEW: Get enhanced context using key plot points and ancestors; a node's
+            # context is reused when the same node is continued again (retries, re-renders)
+            # as long as the story's active key nodes, read fresh here, are unchanged
+            key_node_ids = self._get_key_node_ids(node.story_id)
+            enhanced_context = state_manager.get_cached_enhanced_context(self.user_id, node_id, key_node_ids)
+            if enhanced_context is None:
+                enhanced_context = self.get_enhanced_context(node_id, key_node_ids=key_node_ids)
+                # Empty results may be errors, so only real contexts are cached
+                if enhanced_context:
+                    state_manager.cache_enhanced_context(self.user_id, node_id, key_node_ids, enhanced_context)
 
             # Add all context information to the context object
             context = {
@@ -344,14 +465,16 @@ class GameState:
                 "enhanced_context": enhanced_context  # NEW field
             }
             
-            debug_info = {
-                'active_missions_count': len(active_missions),
-                'character_relationships_count': len(character_relationships),
-                'has_story_context': bool(story_context),
-                'narrative_history_node_count': len(self._story_history_buffer),
-                'enhanced_context_length': len(enhanced_context)  # NEW debug info
-            }
-            logger.debug(f"Node context: {json.dumps(debug_info, indent=2)}")
+            # The debug summary is only built when DEBUG is enabled
+            if logger.isEnabledFor(logging.DEBUG):
+                debug_info = {
+                    'active_missions_count': len(active_missions),
+                    'character_relationships_count': len(character_relationships),
+                    'has_story_context': bool(story_context),
+                    'narrative_history_node_count': len(self._story_history_buffer),
+                    'enhanced_context_length': len(enhanced_context)  # NEW debug info
+                }
+                logger.debug("Node context: %s", orjson.dumps(debug_info, option=orjson.OPT_INDENT_2).decode())
             
             return context
 
@@ -365,41 +488,63 @@ class GameState:
                 "enhanced_context": ""  # Include empty enhanced_context on error
             }
 
+    def _story_sections(self) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        to_dict's current_story and current_node sections.
+        
+        Stories and nodes are not changed once written, so the sections are
+        rebuilt only when current_story or current_node is replaced. The cached
+        dicts are shared between calls and must not be modified.
+        """
+        story = self.current_story
+        node = self.current_node
+        cached_story, cached_node, story_section, node_section = self._sections_cache
+        if story is cached_story and node is cached_node:
+            return story_section, node_section
+        
+        # Each section is guarded once, so its fields are read directly
+        story_section = {
+            "id": story.id,
+            "primary_conflict": story.primary_conflict,
+            "setting": story.setting,
+            "narrative_style": story.narrative_style,
+            "mood": story.mood,
+            "generated_story": story.generated_story,
+            "narrative_text": node.narrative_text if node else None
+        } if story else None
+        node_section = {
+            "id": node.id,
+            "narrative_text": node.narrative_text,
+            "is_endpoint": node.is_endpoint,
+            "branch_metadata": node.branch_metadata
+        } if node else None
+        self._sections_cache = (story, node, story_section, node_section)
+        return story_section, node_section
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert the current state to a dictionary."""
+        story_section, node_section = self._story_sections()
+        progress = self.user_progress
         return {
             "user_id": self.user_id,
-            "current_story": {
-                "id": self.current_story.id if self.current_story else None,
-                "primary_conflict": self.current_story.primary_conflict if self.current_story else None,
-                "setting": self.current_story.setting if self.current_story else None,
-                "narrative_style": self.current_story.narrative_style if self.current_story else None,
-                "mood": self.current_story.mood if self.current_story else None,
-                "generated_story": self.current_story.generated_story if self.current_story else None,
-                "narrative_text": self.current_node.narrative_text if self.current_node else None
-            } if self.current_story else None,
-            "current_node": {
-                "id": self.current_node.id if self.current_node else None,
-                "narrative_text": self.current_node.narrative_text if self.current_node else None,
-                "is_endpoint": self.current_node.is_endpoint if self.current_node else None,
-                "branch_metadata": self.current_node.branch_metadata if self.current_node else None
-            } if self.current_node else None,
+            "current_story": story_section,
+            "current_node": node_section,
             "active_missions": [
                 mission.to_dict() for mission in self.active_missions
             ] if self.active_missions else [],
             "user_progress": {
-                "user_id": self.user_progress.user_id if self.user_progress else None,
-                "current_story_id": self.user_progress.current_story_id if self.user_progress else None,
-                "current_node_id": self.user_progress.current_node_id if self.user_progress else None,
-                "level": self.user_progress.level if self.user_progress else None,
-                "experience_points": self.user_progress.experience_points if self.user_progress else None,
-                "currency_balances": self.user_progress.currency_balances if self.user_progress else None,
-                "active_missions": self.user_progress.active_missions if self.user_progress else None,
-                "completed_missions": self.user_progress.completed_missions if self.user_progress else None,
-                "failed_missions": self.user_progress.failed_missions if self.user_progress else None,
-                "choice_history": self.user_progress.choice_history if self.user_progress else None,
-                "encountered_characters": self.user_progress.encountered_characters if self.user_progress else None
-            } if self.user_progress else None
+                "user_id": progress.user_id,
+                "current_story_id": progress.current_story_id,
+                "current_node_id": progress.current_node_id,
+                "level": progress.level,
+                "experience_points": progress.experience_points,
+                "currency_balances": progress.currency_balances,
+                "active_missions": progress.active_missions,
+                "completed_missions": progress.completed_missions,
+                "failed_missions": progress.failed_missions,
+                "choice_history": progress.choice_history,
+                "encountered_characters": progress.encountered_characters
+            } if progress else None
         }
 
     def _load_user_progress(self) -> UserProgress:
@@ -415,15 +560,28 @@ class GameState:
         """Refresh game state from database"""
         logger.info(f"=== Reloading state for user {self.user_id} ===")
         db.session.refresh(self.user_progress)
-        if self.user_progress.current_story_id:
-            self.current_story = StoryGeneration.query.get(self.user_progress.current_story_id)
-        if self.user_progress.current_node_id:
-            self.current_node = StoryNode.query.get(self.user_progress.current_node_id)
-        if self.user_progress.active_missions:
-            self.active_missions = Mission.query.filter(
-                Mission.id.in_(self.user_progress.active_missions),
-                Mission.user_id == self.user_id
-            ).all()
+        # The refreshed progress row acts as the version check: if it still points at the
+        # same story, node and missions, the already loaded objects are reused
+        state_key = (
+            self.user_progress.current_story_id,
+            self.user_progress.current_node_id,
+            tuple(self.user_progress.active_missions or ())
+        )
+        if state_key == self._loaded_state_key:
+            logger.debug("Story, node and missions unchanged; skipping reload queries")
+        else:
+            if self.user_progress.current_story_id:
+                self.current_story = StoryGeneration.query.get(self.user_progress.current_story_id)
+            if self.user_progress.current_node_id:
+                self.current_node = StoryNode.query.options(
+                    load_only(*NODE_STATE_COLUMNS)
+                ).get(self.user_progress.current_node_id)
+            if self.user_progress.active_missions:
+                self.active_missions = Mission.query.filter(
+                    Mission.id.in_(self.user_progress.active_missions),
+                    Mission.user_id == self.user_id
+                ).all()
+            self._loaded_state_key = state_key
             
         # Restore node count from dedicated column
         self._node_count = self.user_progress.node_count
@@ -462,15 +620,19 @@ class GameState:
                 logger.error("No valid story ID for node resolution")
                 raise ValueError("No valid story ID for node resolution")
                 
-            # Verify the story exists
-            story = StoryGeneration.query.get(target_story_id)
+            # Verify the story exists; only its ID is needed here
+            story = StoryGeneration.query.options(
+                load_only(StoryGeneration.id)
+            ).get(target_story_id)
             if not story:
                 logger.error(f"Story with ID {target_story_id} not found")
                 raise ValueError(f"Story with ID {target_story_id} not found")
                 
             # Priority 1: User's current node
             if self.user_progress.current_node_id:
-                node = StoryNode.query.get(self.user_progress.current_node_id)
+                node = StoryNode.query.options(
+                    load_only(*NODE_STATE_COLUMNS)
+                ).get(self.user_progress.current_node_id)
                 if node:
                     # Validate node belongs to the correct story
                     if node.story_id == target_story_id:
@@ -483,7 +645,8 @@ class GameState:
                     logger.warning(f"Current node ID {self.user_progress.current_node_id} is invalid. Attempting to find valid node.")
                     
             # Priority 2: Latest node for story
-            latest_node = StoryNode.query.filter_by(story_id=target_story_id)\
+            latest_node = StoryNode.query.options(load_only(*NODE_STATE_COLUMNS))\
+                .filter_by(story_id=target_story_id)\
                 .order_by(StoryNode.created_at.desc())\
                 .first()
             if latest_node:
@@ -491,7 +654,7 @@ class GameState:
                 return latest_node
                 
             # Priority 3: Root node
-            root_node = StoryNode.query.filter_by(
+            root_node = StoryNode.query.options(load_only(*NODE_STATE_COLUMNS)).filter_by(
                 story_id=target_story_id,
                 parent_node_id=None
             ).first()
@@ -544,10 +707,7 @@ class GameState:
             if update_progress:
                 self.user_progress.current_node_id = node_id
                 self.user_progress.last_active = datetime.utcnow()
-                if not self.user_progress.choice_history:
-                    self.user_progress.choice_history = []
-                if node_id not in self.user_progress.choice_history:
-                    self.user_progress.choice_history.append(node_id)
+                self._record_choice(node_id)
                 # NEW: Merge encountered characters into user progress
                 if self.current_node and self.current_node.branch_metadata:
                     new_chars = self.current_node.branch_metadata.get("encountered_characters", [])
@@ -572,12 +732,27 @@ class GameState:
             logger.error(f"Error transitioning to node {node_id}: {str(e)}")
             raise  # Re-raise to let caller handle the error
 
+    def _record_choice(self, node_id: int):
+        """Append a node to the user's choice history unless it is already there."""
+        history = self.user_progress.choice_history
+        if not history:
+            history = self.user_progress.choice_history = []
+        # Rebuild the set view if the list was replaced (e.g. by a refresh) or
+        # changed outside this method
+        if history is not self._choice_history_list or len(history) != self._choice_history_len:
+            self._choice_history_set = set(history)
+            self._choice_history_list = history
+        if node_id not in self._choice_history_set:
+            history.append(node_id)
+            self._choice_history_set.add(node_id)
+        self._choice_history_len = len(history)
+
     def _update_story_history(self, node):
         """
         Update story history buffer with current node information.
         
-        This method adds the node to the history buffer and maintains the size limit
-        by removing the oldest entries when necessary.
+        This method adds the node to the history buffer; the bounded deque drops
+        the oldest entry once the size limit is reached.
         
         Args:
             node: The StoryNode to add to history
@@ -592,10 +767,8 @@ class GameState:
             "timestamp": datetime.utcnow().isoformat()
         }
         
-        # Add to history buffer and maintain size limit
+        # Add to history buffer; the oldest entry is evicted automatically
         self._story_history_buffer.append(history_entry)
-        if len(self._story_history_buffer) > self._max_history_nodes:
-            self._story_history_buffer.pop(0)  # Remove oldest entry
             
         logger.debug(f"Story history buffer updated, size: {len(self._story_history_buffer)}")
 
@@ -614,23 +787,91 @@ class GameStateManager:
     and Unity game client.
     """
     
+    # Maximum number of (user_id, node_id, key node IDs) enhanced contexts kept in memory
+    ENHANCED_CONTEXT_CACHE_SIZE = 64
+    # Maximum number of per-node ancestor text chains kept in memory
+    ANCESTOR_CACHE_SIZE = 256
+
     def __init__(self):
-        self._listeners = []
+        # Listeners are kept as an immutable tuple, replaced on add/remove, so
+        # notification iterates a stable snapshot even if a listener (un)registers
+        self._listeners: Tuple[Any, ...] = ()
+        self._listener_set = set()
         self._current_state = {}
+        # Serialized copy of each state value as of the last update; values may
+        # alias ORM JSON columns that are mutated in place, so changes are
+        # detected against these rather than the stored values
+        self._state_snapshots: Dict[Any, bytes] = {}
+        # serialize_state output, cleared whenever the state changes
+        self._serialized_state: Optional[str] = None
+        # The LRU caches are shared by the threadpool's request threads, so each
+        # lookup-and-reorder or insert-and-evict runs under the cache's lock
+        self._enhanced_context_cache: "OrderedDict[Tuple[str, int, Tuple[int, ...]], str]" = OrderedDict()
+        self._enhanced_context_lock = threading.Lock()
+        self._ancestor_cache: "OrderedDict[int, Tuple[str, ...]]" = OrderedDict()
+        self._ancestor_lock = threading.Lock()
+    
+    def get_cached_ancestors(self, node_id: int) -> Optional[Tuple[str, ...]]:
+        """Return a node's cached ancestor texts (oldest first), if cached."""
+        with self._ancestor_lock:
+            texts = self._ancestor_cache.get(node_id)
+            if texts is not None:
+                self._ancestor_cache.move_to_end(node_id)
+        return texts
+    
+    def cache_ancestors(self, node_id: int, texts: Tuple[str, ...]):
+        """Cache a node's ancestor texts, evicting the least recently used entry when full."""
+        with self._ancestor_lock:
+            self._ancestor_cache[node_id] = texts
+            self._ancestor_cache.move_to_end(node_id)
+            if len(self._ancestor_cache) > self.ANCESTOR_CACHE_SIZE:
+                self._ancestor_cache.popitem(last=False)
+    
+    def get_cached_enhanced_context(self, user_id: str, node_id: int,
+                                    key_node_ids: Tuple[int, ...]) -> Optional[str]:
+        """Return a previously built enhanced context for a user's node and key node IDs, if cached."""
+        key = (user_id, node_id, key_node_ids)
+        with self._enhanced_context_lock:
+            context = self._enhanced_context_cache.get(key)
+            if context is not None:
+                self._enhanced_context_cache.move_to_end(key)
+        return context
+    
+    def cache_enhanced_context(self, user_id: str, node_id: int,
+                               key_node_ids: Tuple[int, ...], context: str):
+        """Cache an enhanced context, evicting the least recently used entry when full."""
+        key = (user_id, node_id, key_node_ids)
+        with self._enhanced_context_lock:
+            self._enhanced_context_cache[key] = context
+            self._enhanced_context_cache.move_to_end(key)
+            if len(self._enhanced_context_cache) > self.ENHANCED_CONTEXT_CACHE_SIZE:
+                self._enhanced_context_cache.popitem(last=False)
     
     def add_listener(self, listener):
         """Add a listener to be notified of state changes."""
-        if listener not in self._listeners:
-            self._listeners.append(listener)
+        if listener not in self._listener_set:
+            self._listener_set.add(listener)
+            self._listeners = self._listeners + (listener,)
     
     def remove_listener(self, listener):
         """Remove a listener from receiving state updates."""
-        if listener in self._listeners:
-            self._listeners.remove(listener)
+        if listener in self._listener_set:
+            self._listener_set.discard(listener)
+            self._listeners = tuple(registered for registered in self._listeners if registered is not listener)
     
     def update_state(self, state_update: Dict[str, Any]):
-        """Update the current game state and notify all listeners."""
+        """Update the current game state and notify all listeners if any value changed."""
         self._current_state.update(state_update)
+        snapshots = self._state_snapshots
+        changed = False
+        for key, value in state_update.items():
+            snapshot = _snapshot(value)
+            if snapshots.get(key) != snapshot:
+                snapshots[key] = snapshot
+                changed = True
+        if not changed:
+            return
+        self._serialized_state = None
         self._notify_listeners()
     
     def get_state(self) -> Dict[str, Any]:
@@ -639,16 +880,31 @@ class GameStateManager:
     
     def _notify_listeners(self):
         """Notify all registered listeners of state changes."""
-        for listener in self._listeners:
-            listener.on_state_changed(self._current_state)
+        listeners = self._listeners
+        if not listeners:
+            return
+        state = self._current_state
+        for listener in listeners:
+            listener.on_state_changed(state)
     
     def serialize_state(self) -> str:
-        """Serialize the current game state to JSON string."""
-        return json.dumps(self._current_state)
+        """Serialize the game state as of the last update to JSON string; reused until the state changes."""
+        if self._serialized_state is None:
+            # Assembled from the per-key snapshots, so an in-place mutation of a
+            # stored value cannot leave a cached result out of date
+            self._serialized_state = "{%s}" % ",".join(
+                "%s:%s" % (orjson.dumps(str(key)).decode(), snapshot.decode())
+                for key, snapshot in self._state_snapshots.items()
+            )
+        return self._serialized_state
     
     def load_state(self, state_json: str):
         """Load a previously saved game state from JSON string."""
-        self._current_state = json.loads(state_json)
+        self._current_state = orjson.loads(state_json)
+        self._state_snapshots = {
+            key: _snapshot(value) for key, value in self._current_state.items()
+        }
+        self._serialized_state = None
         self._notify_listeners()
 
 # Create a singleton instance
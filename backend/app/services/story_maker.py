@@ -59,18 +59,27 @@ logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 logging.getLogger("httpx").setLevel(logging.DEBUG)
 
+# Shared OpenAI client and the API key it was created with; the client keeps a
+# connection pool, so it is reused until the key changes
+_openai_client = None
+_openai_client_key = None
+
 def get_openai_client():
     """Get an OpenAI client with the current API key."""
+    global _openai_client, _openai_client_key
     try:
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
             error_msg = "OPENAI_API_KEY is missing. Ensure it is configured in the production environment."
             logger.error(error_msg)
             raise ValueError(error_msg)
+        if _openai_client is not None and _openai_client_key == api_key:
+            return _openai_client
         client = OpenAI(api_key=api_key)
         if client is None:
             logger.error("Failed to create OpenAI client")
             raise ValueError("Failed to create OpenAI client")
+        _openai_client, _openai_client_key = client, api_key
         return client
     except Exception as e:
         logger.error(f"Error initializing OpenAI client: {str(e)}")
@@ -432,7 +441,8 @@ def generate_story(**kwargs) -> Dict[str, Any]:
     generator = StoryGenerator(client=client)
     
     logger.info("=== generate_story function called ===")
-    logger.debug(f"Story generation parameters: {json.dumps(kwargs, default=str, indent=2)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Story generation parameters: %s", json.dumps(kwargs, default=str, indent=2))
     
     story_data = generator.generate_story(**kwargs)
     
@@ -452,7 +462,8 @@ def generate_story(**kwargs) -> Dict[str, Any]:
         "mood": story_data.get("mood")
     })
     
-    logger.debug(f"Final flattened story response: {json.dumps(flattened, indent=2)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Final flattened story response: %s", json.dumps(flattened, indent=2))
     return flattened
 
 # --- STORY_OPTIONS moved to the end of the file ---
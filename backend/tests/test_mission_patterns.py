@@ -0,0 +1,81 @@
+"""Tests for the mission text patterns in app.services.mission_patterns."""
+
+import pytest
+
+from app.services.mission_patterns import (
+    DEADLINE_RE,
+    FALLBACK_GIVER_RE,
+    FALLBACK_OBJECTIVE_RE,
+    FALLBACK_REWARD_RE,
+    FALLBACK_TARGET_RE,
+    OBJECTIVE_RE,
+    REWARD_RE,
+    VILLAIN_RE
+)
+
+
+@pytest.mark.parametrize("dialogue, target", [
+    ("You must stop Viktor Kane before dawn.", "Viktor Kane"),
+    ("Investigate Moreau and report back.", None),
+    ("We need you to investigate Moreau.", "Moreau"),
+    ("The target is Elena Sorova.", "Elena Sorova"),
+    ("Our enemy will be Drax.", "Drax"),
+    ("Go find the courier.", None),
+])
+def test_villain_re(dialogue, target):
+    match = VILLAIN_RE.search(dialogue)
+    assert (match.group(1) if match else None) == target
+
+
+@pytest.mark.parametrize("dialogue, objective", [
+    ("I need you to recover the drive. Quickly.", "recover the drive"),
+    ("Listen: your mission is to shadow the ambassador.", "shadow the ambassador"),
+    ("Your mission is to wait.", None),
+    ("The objective is to plant the bug", "plant the bug"),
+    ("Your task is to wait", "wait"),
+    ("Nothing to do today.", None),
+])
+def test_objective_re(dialogue, objective):
+    match = OBJECTIVE_RE.search(dialogue)
+    assert (match.group(1) if match else None) == objective
+
+
+@pytest.mark.parametrize("dialogue, deadline", [
+    ("Get it done within 3 days.", ("3", "days")),
+    ("The deadline is 48 hours from now.", ("48", "hours")),
+    ("It must be completed in 2 weeks.", ("2", "weeks")),
+    ("Move now, you have 12 hours.", ("12", "hours")),
+    ("Move now, you have 5 minutes.", None),
+])
+def test_deadline_re(dialogue, deadline):
+    match = DEADLINE_RE.search(dialogue)
+    assert (match.groups() if match else None) == deadline
+
+
+@pytest.mark.parametrize("dialogue, reward", [
+    ("There's a reward of 5,000💵 in it.", ("5,000", "💵")),
+    ("We'll pay you 20 💎.", ("20", "💎")),
+    ("A payment of 1400💷 on delivery.", ("1400", "💷")),
+    ("Take the 3,000 💶 reward.", ("3,000", "💶")),
+    ("A reward of 500 dollars.", None),
+])
+def test_reward_re(dialogue, reward):
+    match = REWARD_RE.search(dialogue)
+    if match is None:
+        assert reward is None
+    elif match.group("amount"):
+        assert match.group("amount", "currency") == reward
+    else:
+        assert match.group("amount_before", "currency_before") == reward
+
+
+def test_fallback_patterns():
+    story = (
+        "A shadowy figure of Nexus Corp briefed you on Kane's plans. "
+        "Your mission is to steal the codes. Your reward? 2,500 💴"
+    )
+    assert FALLBACK_GIVER_RE.search(story).group(1) == "Nexus Corp"
+    assert FALLBACK_TARGET_RE.search(story).group(1) == "Kane's"
+    assert FALLBACK_TARGET_RE.search("a war against Drax").group(2) == "Drax"
+    assert FALLBACK_OBJECTIVE_RE.search(story).group(1).strip() == "steal the codes"
+    assert FALLBACK_REWARD_RE.search(story).groups() == ("2,500", "💴")
@@ -0,0 +1,136 @@
+"""Tests that TrieRouter resolves requests exactly like FastAPI's stock router."""
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routing import TrieRouter, install_trie_router
+
+
+def build_app(trie: bool) -> FastAPI:
+    app = FastAPI()
+    if trie:
+        install_trie_router(app)
+
+    @app.get("/")
+    def root():
+        return "root"
+
+    @app.get("/items/special")
+    def special_item():
+        return "special"
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: str):
+        return ["item", item_id]
+
+    @app.post("/items/{item_id}")
+    def post_item(item_id: str):
+        return ["posted", item_id]
+
+    @app.get("/items/{item_id}/owner/{owner}")
+    def item_owner(item_id: str, owner: str):
+        return [item_id, owner]
+
+    @app.get("/users/")
+    def users():
+        return "users"
+
+    @app.get("/files/{file_path:path}")
+    def read_file(file_path: str):
+        return ["file", file_path]
+
+    sub = APIRouter()
+
+    @sub.get("/status")
+    def status():
+        return "v1 status"
+
+    app.include_router(sub, prefix="/api/v1")
+
+    mounted = FastAPI()
+
+    @mounted.get("/ping")
+    def ping():
+        return "pong"
+
+    app.mount("/mounted", mounted)
+    return app
+
+
+REQUESTS = [
+    ("GET", "/"),
+    ("GET", "/items/special"),
+    ("GET", "/items/42"),
+    ("POST", "/items/42"),
+    ("POST", "/items/special"),
+    ("DELETE", "/items/42"),
+    ("GET", "/items/42/owner/bob"),
+    ("GET", "/items/42/owner"),
+    ("GET", "/users/"),
+    ("GET", "/users"),
+    ("GET", "/files/a/b/c.txt"),
+    ("GET", "/api/v1/status"),
+    ("GET", "/mounted/ping"),
+    ("GET", "/missing"),
+    ("GET", "/items/42/"),
+]
+
+
+@pytest.fixture(scope="module")
+def clients():
+    stock = TestClient(build_app(trie=False))
+    trie = TestClient(build_app(trie=True))
+    return stock, trie
+
+
+@pytest.mark.parametrize("method, path", REQUESTS)
+def test_trie_router_matches_stock_routing(clients, method, path):
+    stock, trie = clients
+    expected = stock.request(method, path, follow_redirects=False)
+    actual = trie.request(method, path, follow_redirects=False)
+    assert actual.status_code == expected.status_code
+    assert actual.content == expected.content
+    assert actual.headers.get("location") == expected.headers.get("location")
+    assert actual.headers.get("allow") == expected.headers.get("allow")
+
+
+def test_install_keeps_the_router_instance():
+    app = build_app(trie=False)
+    router = app.router
+    install_trie_router(app)
+    assert app.router is router
+    assert isinstance(app.router, TrieRouter)
+
+
+def test_routes_added_after_first_request_are_indexed():
+    app = build_app(trie=True)
+    client = TestClient(app)
+    assert client.get("/late").status_code == 404
+
+    @app.get("/late")
+    def late():
+        return "late"
+
+    assert client.get("/late").json() == "late"
+
+
+def test_index_is_per_router():
+    first = build_app(trie=True)
+    second = FastAPI()
+    install_trie_router(second)
+    TestClient(first).get("/")
+    assert second.router._trie_index is None
+    assert TestClient(second).get("/").status_code == 404
+
+
+def test_candidates_are_narrowed_by_path():
+    app = build_app(trie=True)
+    paths = [getattr(route, "path", None) for route in app.router._candidates("/items/42")]
+    assert "/items/{item_id}" in paths
+    assert "/items/special" not in paths
+    assert "/" not in paths
+    assert "/users/" not in paths
+    # Routes the trie cannot index stay candidates, in registration order
+    assert paths.index("/items/{item_id}") < paths.index("/files/{file_path:path}")
+    assert "/mounted" in paths
@@ -0,0 +1,46 @@
+"""Tests for iter_speaker_dialogue in app.services.mission_patterns."""
+
+from app.services.mission_patterns import iter_speaker_dialogue
+
+
+def passages(story_text, names):
+    speakers = {name: name.upper() for name in names}
+    return list(iter_speaker_dialogue(story_text, speakers))
+
+
+def test_passage_after_a_name_is_attributed():
+    story = 'Anna leaned in. "Find the courier." The rain kept falling.'
+    assert passages(story, ["Anna"]) == [("Anna", "ANNA", "Find the courier.")]
+
+
+def test_passages_are_yielded_in_story_order():
+    story = 'Boris said, "First." Then Anna said, "Second." Boris added, "Third."'
+    assert [(name, text) for name, _, text in passages(story, ["Anna", "Boris"])] == [
+        ("Boris", "First."),
+        ("Anna", "Second."),
+        ("Boris", "Third."),
+    ]
+
+
+def test_last_mention_in_the_narration_wins():
+    story = 'Anna glanced at Boris, who said "Go."'
+    assert passages(story, ["Anna", "Boris"])[0][0] == "Boris"
+
+
+def test_longer_name_wins_a_tie():
+    story = 'Anna Bell said "Hello."'
+    assert passages(story, ["Anna", "Anna Bell"])[0][0] == "Anna Bell"
+
+
+def test_names_inside_quotes_do_not_start_a_passage():
+    story = 'Boris said "Ask Anna." The lights went out. "Now," someone whispered.'
+    assert passages(story, ["Anna", "Boris"]) == [("Boris", "BORIS", "Ask Anna.")]
+
+
+def test_unclosed_quote_is_ignored():
+    assert passages('Anna said "Never finished', ["Anna"]) == []
+
+
+def test_no_speakers_or_no_mentions():
+    assert passages('Anna said "Hi."', []) == []
+    assert passages('Someone said "Hi."', ["Anna"]) == []
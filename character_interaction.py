@@ -168,7 +168,8 @@ class CharacterInteractionService:
         user_id: str,
         story_id: str,
         current_node_id: str,
-        next_node_id: str
+        next_node_id: str,
+        commit: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Update character relationships based on story progression.
@@ -178,54 +179,65 @@ class CharacterInteractionService:
             story_id (str): Current story ID
             current_node_id (str): Current story node ID
             next_node_id (str): Next story node ID
+            commit (bool): Commit the changes; pass False to leave them in the
+                caller's transaction
             
         Returns:
             List[Dict[str, Any]]: List of relationship updates
         """
-        # Get user progress
-        user_progress = UserProgress.query.filter_by(user_id=user_id).first()
-        if not user_progress:
-            return []
-            
         # Get character evolutions
         char_evolutions = CharacterEvolution.query.filter_by(
             user_id=user_id,
             story_id=story_id
         ).all()
         
-        updates = []
+        # Calculate relationship changes based on story progression up front,
+        # so nothing else is loaded or written when no relationship changed
+        changes = []
         for char_evolution in char_evolutions:
-            # Calculate relationship changes based on story progression
             relationship_change = self._calculate_story_progression_change(
                 current_node_id,
                 next_node_id,
                 char_evolution.character_id
             )
-            
             if relationship_change != 0:
-                # Update user progress
-                user_progress.change_character_relationship(
-                    character_id=char_evolution.character_id,
-                    change_amount=relationship_change,
-                    reason=f"Story progression from node {current_node_id} to {next_node_id}"
-                )
-                
-                # Update character evolution
-                evolve_character_traits(
-                    character_evolution_id=char_evolution.id,
-                    story_context=f"Story progressed from node {current_node_id} to {next_node_id}"
-                )
-                
-                updates.append({
-                    "character_id": char_evolution.character_id,
-                    "relationship_level": user_progress.encountered_characters[str(char_evolution.character_id)]["relationship_level"],
-                    "trust_level": char_evolution.trust_level,
-                    "loyalty_level": char_evolution.loyalty_level,
-                    "change": relationship_change
-                })
+                changes.append((char_evolution, relationship_change))
+        if not changes:
+            return []
+        
+        # Get user progress
+        user_progress = UserProgress.query.filter_by(user_id=user_id).first()
+        if not user_progress:
+            return []
+        
+        reason = f"Story progression from node {current_node_id} to {next_node_id}"
+        story_context = f"Story progressed from node {current_node_id} to {next_node_id}"
+        updates = []
+        for char_evolution, relationship_change in changes:
+            # Update user progress
+            user_progress.change_character_relationship(
+                character_id=char_evolution.character_id,
+                change_amount=relationship_change,
+                reason=reason
+            )
+            
+            # Update character evolution
+            evolve_character_traits(
+                character_evolution_id=char_evolution.id,
+                story_context=story_context
+            )
+            
+            updates.append({
+                "character_id": char_evolution.character_id,
+                "relationship_level": user_progress.encountered_characters[str(char_evolution.character_id)]["relationship_level"],
+                "trust_level": char_evolution.trust_level,
+                "loyalty_level": char_evolution.loyalty_level,
+                "change": relationship_change
+            })
         
         # Commit changes
-        db.session.commit()
+        if commit:
+            db.session.commit()
         
         return updates
 